@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Sustained-load memory check for the memory-budgeted pipeline
+
+Drives synthetic readings through WeatherDataProcessor with local stand-ins,
+including a simulated InfluxDB outage, and uses tracemalloc to check that
+traced memory reaches a steady state bounded by the memory budget.
+
+Usage (from data-processor/):
+    python -m bench.memorySoak --messages 5000 --budget-mb 0.5
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+
+
+def reading(i):
+    return json.dumps({
+        "Temperature": 20 + (i % 100) * 0.1,
+        "Humidity": 55 + (i % 30),
+        "Barometric Pressure": 1010 + (i % 50) * 0.05,
+        "Wind Direction": (i * 7) % 360,
+        "Avg Wind Speed": (i % 20) * 0.3,
+        "Max Wind Speed": (i % 20) * 0.5,
+        "Rainfall (1hr)": 0.0,
+        "Rainfall (24hr)": (i % 500) * 0.1,
+    }).encode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check steady-state memory under sustained load")
+    parser.add_argument("--messages", type=int, default=5000, help="Messages per phase")
+    parser.add_argument("--budget-mb", type=float, default=1.0, help="MEMORY_BUDGET_MB for the run")
+    parser.add_argument("--tolerance-kb", type=float, default=512.0,
+                        help="Allowed traced-memory growth between the two steady-state samples")
+    args = parser.parse_args(argv)
+
+    spill_dir = tempfile.mkdtemp(prefix="weather-edge-spill-")
+    for name, value in (("INFLUXDB_TOKEN", "soak"), ("INFLUXDB_ORG", "soak"),
+                        ("INFLUXDB_BUCKET", "soak"), ("MQTT_PASSWORD", "soak"),
+                        ("MQTT_PORT", "1883"), ("MEASUREMENT_NAME", "weather_sensor")):
+        os.environ.setdefault(name, value)
+    os.environ["MEMORY_BUDGET_MB"] = str(args.budget_mb)
+    os.environ["SPILL_DIR"] = spill_dir
+
+    from bench.standIns import LocalInfluxStandIn, LocalPublisherStandIn
+    from dataProcessor import WeatherDataProcessor
+    from mqtt.mqttReceiver import MQTTReceiver
+
+    influx = LocalInfluxStandIn()
+    publisher = LocalPublisherStandIn()
+    publisher.connect()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        processor = WeatherDataProcessor(influx_client=influx, aws_publisher=publisher)
+        receiver = MQTTReceiver(data_callback=processor.process_weather_data)
+
+        def run(count, offset):
+            for i in range(offset, offset + count):
+                receiver.handle_message("weather/data", reading(i))
+
+        tracemalloc.start()
+        run(args.messages, 0)  # Warm up caches and fill the derived-metrics history
+        influx.available = False
+        run(args.messages, args.messages)  # Outage: pending writes fill the budget, then spill
+        outage_current, _ = tracemalloc.get_traced_memory()
+        run(args.messages, 2 * args.messages)  # Still down: memory must not keep growing
+        steady_current, peak = tracemalloc.get_traced_memory()
+        influx.available = True
+        run(args.messages, 3 * args.messages)  # Recovery: spilled writes drain
+        recovered_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report = processor.get_memory_report()
+        processor.shutdown()
+
+    growth_kb = (steady_current - outage_current) / 1024
+    pending = report['components']['influx_pending_writes']
+    print(f"Traced memory during outage:   {outage_current / 1024:.0f} KiB")
+    print(f"Traced memory after 2x outage: {steady_current / 1024:.0f} KiB (growth {growth_kb:.0f} KiB)")
+    print(f"Traced memory after recovery:  {recovered_current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB")
+    print(f"RSS: {report['rss_bytes'] / 1048576:.1f} MiB")
+    print(f"Pending writes: peak {pending['peak_bytes']} bytes, spilled {pending['spilled']}, shed {pending['shed']}")
+    print(f"Points written: {influx.points_written}")
+
+    ok = growth_kb <= args.tolerance_kb and pending['peak_bytes'] <= args.budget_mb * 1024 * 1024
+    print("✅ Memory reached a steady state within budget" if ok else "❌ Memory kept growing under sustained load")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
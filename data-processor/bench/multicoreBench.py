@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Throughput of the multi-process pipeline by worker count
+
+Pushes synthetic readings through MultiProcessPipeline with in-process
+InfluxDB/AWS IoT stand-ins and reports messages per second for 1..N workers,
+alongside the single-process pipeline as a baseline.
+
+Usage (from data-processor/):
+    python -m bench.multicoreBench --messages 20000 --max-workers 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+
+def _ensure_env():
+    # Stand-in sinks need no real credentials, but Config still validates them
+    for name, value in (("INFLUXDB_TOKEN", "bench"), ("INFLUXDB_ORG", "bench"),
+                        ("INFLUXDB_BUCKET", "bench"), ("MQTT_PASSWORD", "bench"),
+                        ("MQTT_PORT", "1883"), ("MEASUREMENT_NAME", "weather_sensor")):
+        os.environ.setdefault(name, value)
+    os.environ.setdefault("SPILL_DIR", tempfile.mkdtemp(prefix="weather-edge-spill-"))
+
+
+def standin_processor_factory(worker_index, worker_count):
+    """Worker factory using local stand-ins instead of real sink connections"""
+    from bench.standIns import LocalInfluxStandIn, LocalPublisherStandIn
+    from dataProcessor import WeatherDataProcessor
+
+    publisher = LocalPublisherStandIn(client_id=f"bench-weather-edge-w{worker_index}")
+    publisher.connect()
+    return WeatherDataProcessor(
+        influx_client=LocalInfluxStandIn(),
+        aws_publisher=publisher,
+        worker_index=worker_index,
+        worker_count=worker_count
+    )
+
+
+def make_payloads(count):
+    return [json.dumps({
+        "Temperature": 20 + (i % 100) * 0.1,
+        "Humidity": 55 + (i % 30),
+        "Barometric Pressure": 1010 + (i % 50) * 0.05,
+        "Wind Direction": (i * 7) % 360,
+        "Avg Wind Speed": (i % 20) * 0.3,
+        "Max Wind Speed": (i % 20) * 0.5,
+        "Rainfall (1hr)": 0.0,
+        "Rainfall (24hr)": (i % 500) * 0.1,
+    }).encode("utf-8") for i in range(count)]
+
+
+def bench_single_process(payloads):
+    from mqtt.mqttReceiver import MQTTReceiver
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        processor = standin_processor_factory(None, 1)
+        receiver = MQTTReceiver(data_callback=processor.process_weather_data)
+        start = time.perf_counter()
+        for payload in payloads:
+            receiver.handle_message("weather/data", payload)
+        elapsed = time.perf_counter() - start
+        processor.shutdown()
+    return len(payloads) / elapsed
+
+
+def bench_workers(payloads, worker_count):
+    from pipeline.multiProcess import MultiProcessPipeline
+
+    pipeline = MultiProcessPipeline(
+        worker_count=worker_count,
+        processor_factory=standin_processor_factory,
+        quiet=True
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        pipeline.start_workers()
+        # Let workers finish connecting before timing
+        time.sleep(1.0)
+        start = time.perf_counter()
+        for payload in payloads:
+            pipeline.dispatch("weather/data", payload)
+        pipeline.stop_workers()
+        elapsed = time.perf_counter() - start
+    return len(payloads) / elapsed, pipeline.dropped_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark multi-process pipeline scaling")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    _ensure_env()
+    payloads = make_payloads(args.messages)
+
+    print(f"CPU cores: {os.cpu_count()}, messages: {args.messages}")
+    baseline = bench_single_process(payloads)
+    print(f"single process : {baseline:8.0f} msg/s")
+    for workers in range(1, args.max_workers + 1):
+        throughput, dropped = bench_workers(payloads, workers)
+        print(f"{workers:2d} worker(s)   : {throughput:8.0f} msg/s  "
+              f"({throughput / baseline:.2f}x single process, {dropped} dropped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
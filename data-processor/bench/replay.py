@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Replay a captured MQTT traffic file through WeatherDataProcessor
+
+Usage (from data-processor/):
+    python -m bench.replay capture.bin --speed 1
+    python -m bench.replay capture.bin --speed 10 --aws-latency-ms 120
+    python -m bench.replay capture.bin --speed max --influx local --output release-1.2.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+
+def parse_speed(value):
+    if value.lower() == "max":
+        return None
+    speed = float(value.rstrip("xX"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_processor(args):
+    """Create a WeatherDataProcessor wired to local sinks"""
+    if args.influx == "standin":
+        # Stand-in sinks need no real credentials, but Config still validates them
+        for name, value in (("INFLUXDB_TOKEN", "replay"), ("INFLUXDB_ORG", "replay"),
+                            ("INFLUXDB_BUCKET", "replay"), ("MQTT_PASSWORD", "replay"),
+                            ("MQTT_PORT", "1883"), ("MEASUREMENT_NAME", "weather_sensor")):
+            os.environ.setdefault(name, value)
+
+    from bench.standIns import LocalInfluxStandIn, LocalPublisherStandIn
+    from dataProcessor import WeatherDataProcessor
+
+    influx_client = LocalInfluxStandIn(args.influx_latency_ms) if args.influx == "standin" else None
+    aws_publisher = LocalPublisherStandIn(args.aws_latency_ms)
+    aws_publisher.connect()
+    return WeatherDataProcessor(influx_client=influx_client, aws_publisher=aws_publisher)
+
+
+def replay(args):
+    from mqtt.mqttCapture import read_capture
+    from mqtt.mqttReceiver import MQTTReceiver
+
+    processor = build_processor(args)
+    results = []
+    receiver = MQTTReceiver(
+        data_callback=lambda payload: results.append(processor.process_weather_data(payload))
+    )
+
+    latencies = []
+    lags = []
+    dup_count = 0
+    first_recorded = None
+    start = time.perf_counter()
+    quiet = open(os.devnull, "w") if args.quiet else None
+
+    with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+        for record in read_capture(args.capture):
+            if args.limit and len(latencies) >= args.limit:
+                break
+            if first_recorded is None:
+                first_recorded = record.timestamp
+
+            # Pace against the recorded inter-arrival times
+            if args.speed is not None:
+                due = (record.timestamp - first_recorded) / args.speed
+                wait = due - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+                lags.append(max(0.0, -wait))
+
+            dup_count += record.dup
+            t0 = time.perf_counter()
+            receiver.handle_message(record.topic, record.payload)
+            latencies.append(time.perf_counter() - t0)
+
+    elapsed = time.perf_counter() - start
+    processor.shutdown()
+    if quiet:
+        quiet.close()
+
+    latencies.sort()
+    lags.sort()
+    summary = {
+        "capture": os.path.basename(args.capture),
+        "speed": "max" if args.speed is None else args.speed,
+        "messages": len(latencies),
+        "redelivered": dup_count,
+        "succeeded": sum(1 for r in results if r),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_msg_s": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+        },
+        "schedule_lag_ms_p99": round(percentile(lags, 99) * 1000, 3),
+    }
+    return summary
+
+
+def compare(summary, baseline_path):
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    print(f"Comparison against {baseline_path}:")
+    for key in ("throughput_msg_s",):
+        print(f"   {key}: {baseline.get(key)} -> {summary[key]}")
+    for key, value in summary["latency_ms"].items():
+        print(f"   latency {key} (ms): {baseline.get('latency_ms', {}).get(key)} -> {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured MQTT traffic through the processor")
+    parser.add_argument("capture", help="Capture file written with MQTT_CAPTURE_FILE")
+    parser.add_argument("--speed", type=parse_speed, default=1.0,
+                        help="Replay speed: 1 (real time), N for N times faster, or 'max'")
+    parser.add_argument("--influx", choices=["standin", "local"], default="standin",
+                        help="'standin' for an in-process sink, 'local' for the InfluxDB from the environment")
+    parser.add_argument("--influx-latency-ms", type=float, default=0.0,
+                        help="Simulated write latency for the InfluxDB stand-in")
+    parser.add_argument("--aws-latency-ms", type=float, default=0.0,
+                        help="Simulated publish round-trip for the AWS IoT stand-in")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after this many messages")
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-message pipeline output")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    parser.add_argument("--compare", help="Compare against a previously written JSON summary")
+    args = parser.parse_args(argv)
+
+    summary = replay(args)
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"✅ Summary written to {args.output}")
+    if args.compare:
+        compare(summary, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
 from .config import Config
+from .configWatcher import ConfigWatcher
 
-__all__ = ['Config']
\ No newline at end of file
+__all__ = ['Config', 'ConfigWatcher']
\ No newline at end of file
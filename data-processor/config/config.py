@@ -1,4 +1,5 @@
 import os
+import threading
 
 class Config:
     # InfluxDB Configuration
@@ -13,11 +14,59 @@ class Config:
     MQTT_BROKER_USERNAME = os.getenv("SUB_USERNAME")
     MQTT_BROKER_PASSWORD = os.getenv("MQTT_PASSWORD")
     MQTT_TOPIC = os.getenv("MQTT_TOPIC")
+    MQTT_CAPTURE_FILE = os.getenv("MQTT_CAPTURE_FILE")
+    MQTT_MAX_PAYLOAD_BYTES = int(os.getenv("MQTT_MAX_PAYLOAD_BYTES", str(1024 * 1024)))
     
     # Data Configuration
     DATA_LOCATION = os.getenv("DATA_LOCATION", "unknown")
     MEASUREMENT_NAME = os.getenv("MEASUREMENT_NAME")
     
+    # Multi-process Configuration (1 = process everything in the receiver process)
+    WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+    RING_SLOT_COUNT = int(os.getenv("RING_SLOT_COUNT", "1024"))
+    RING_SLOT_SIZE = int(os.getenv("RING_SLOT_SIZE", "16384"))
+    
+    # Adaptive Flush Configuration (opt-in batching of sink writes)
+    ADAPTIVE_FLUSH_ENABLED = os.getenv("ADAPTIVE_FLUSH_ENABLED", "false").lower() == "true"
+    INFLUX_LATENCY_SLO_MS = float(os.getenv("INFLUX_LATENCY_SLO_MS", "500"))
+    AWS_LATENCY_SLO_MS = float(os.getenv("AWS_LATENCY_SLO_MS", "5000"))
+    FLUSH_MAX_BATCH = int(os.getenv("FLUSH_MAX_BATCH", "500"))
+    FLUSH_MAX_INTERVAL = float(os.getenv("FLUSH_MAX_INTERVAL", "10"))
+    INFLUX_MAX_INFLIGHT = int(os.getenv("INFLUX_MAX_INFLIGHT", "4"))
+    AWS_MAX_INFLIGHT = int(os.getenv("AWS_MAX_INFLIGHT", "16"))
+    
+    # Memory Budget Configuration
+    MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "64"))
+    MEMORY_RSS_LIMIT_MB = float(os.getenv("MEMORY_RSS_LIMIT_MB", "0"))
+    MEMORY_REPORT_INTERVAL = float(os.getenv("MEMORY_REPORT_INTERVAL", "300"))
+    SPILL_DIR = os.getenv("SPILL_DIR", "spill")
+    SPILL_MAX_MB = float(os.getenv("SPILL_MAX_MB", "256"))
+    
+    # Hot Reload Configuration
+    CONFIG_FILE = os.getenv("CONFIG_FILE")
+    CONFIG_WATCH_INTERVAL = float(os.getenv("CONFIG_WATCH_INTERVAL", "10"))
+    
+    # Settings that can change at runtime: attribute -> (environment variable, default)
+    RELOADABLE_SETTINGS = {
+        'INFLUXDB_URL': ("INFLUXDB_ROUTE", None),
+        'INFLUXDB_TOKEN': ("INFLUXDB_TOKEN", None),
+        'INFLUXDB_ORG': ("INFLUXDB_ORG", None),
+        'INFLUXDB_BUCKET': ("INFLUXDB_BUCKET", None),
+        'MQTT_TOPIC': ("MQTT_TOPIC", None),
+        'DATA_LOCATION': ("DATA_LOCATION", "unknown"),
+        'MEASUREMENT_NAME': ("MEASUREMENT_NAME", None)
+    }
+    _reload_lock = threading.Lock()
+    
+    # Profiling Configuration (opt-in)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    TRACE_FILE = os.getenv("TRACE_FILE", "traces/weather-edge-trace.json")
+    TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+    TRACE_BACKUP_COUNT = int(os.getenv("TRACE_BACKUP_COUNT", "3"))
+    PROFILER_DURATION = float(os.getenv("PROFILER_DURATION", "30"))
+    PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "10"))
+    PROFILER_ON_START = os.getenv("PROFILER_ON_START", "false").lower() == "true"
+    
     @classmethod
     def validate(cls):
         """Validate required configuration"""
@@ -35,15 +84,51 @@ class Config:
         return True
     
     @classmethod
-    def get_influx_config(cls):
-        """Get InfluxDB configuration as dict"""
-        return {
-            'url': cls.INFLUXDB_URL,
-            'token': cls.INFLUXDB_TOKEN,
-            'org': cls.INFLUXDB_ORG,
-            'bucket': cls.INFLUXDB_BUCKET
+    def reload(cls):
+        """
+        Re-read reloadable settings from the environment, overlaid with CONFIG_FILE
+        All changes are validated first and then applied together.
+        Returns:
+            Dict of changed attribute -> (old value, new value)
+        """
+        values = dict(os.environ)
+        if cls.CONFIG_FILE and os.path.exists(cls.CONFIG_FILE):
+            from dotenv import dotenv_values
+            values.update({k: v for k, v in dotenv_values(cls.CONFIG_FILE).items() if v is not None})
+        
+        new_settings = {
+            attr: values.get(env_var, default)
+            for attr, (env_var, default) in cls.RELOADABLE_SETTINGS.items()
         }
         
+        required = ['INFLUXDB_TOKEN', 'INFLUXDB_ORG', 'INFLUXDB_BUCKET']
+        missing = [name for name in required if not new_settings[name]]
+        if missing:
+            raise ValueError(f"Reloaded configuration is missing: {missing}")
+        
+        with cls._reload_lock:
+            changed = {
+                attr: (getattr(cls, attr), value)
+                for attr, value in new_settings.items()
+                if getattr(cls, attr) != value
+            }
+            for attr, (_, value) in changed.items():
+                setattr(cls, attr, value)
+        return changed
+    
+    @classmethod
+    def get_influx_config(cls):
+        """Get InfluxDB configuration (with the data tags written alongside) as dict"""
+        with cls._reload_lock:
+            return {
+                'url': cls.INFLUXDB_URL,
+                'token': cls.INFLUXDB_TOKEN,
+                'org': cls.INFLUXDB_ORG,
+                'bucket': cls.INFLUXDB_BUCKET,
+                'measurement': cls.MEASUREMENT_NAME,
+                'location': cls.DATA_LOCATION
+            }
+        
     @classmethod
     def get_mqtt_config(cls):
         """Get MQTT configuration as dict"""
@@ -52,7 +137,60 @@ class Config:
             'port': cls.MQTT_BROKER_PORT,
             'username': cls.MQTT_BROKER_USERNAME,
             'password': cls.MQTT_BROKER_PASSWORD,
-            'topic': cls.MQTT_TOPIC
+            'topic': cls.MQTT_TOPIC,
+            'capture_file': cls.MQTT_CAPTURE_FILE,
+            'max_payload_bytes': cls.MQTT_MAX_PAYLOAD_BYTES
+        }
+    
+    @classmethod
+    def get_pipeline_config(cls):
+        """Get multi-process pipeline configuration as dict"""
+        return {
+            'worker_count': cls.WORKER_PROCESSES,
+            'slot_count': cls.RING_SLOT_COUNT,
+            'slot_size': cls.RING_SLOT_SIZE,
+            'max_payload_bytes': cls.MQTT_MAX_PAYLOAD_BYTES
+        }
+    
+    @classmethod
+    def get_flush_config(cls):
+        """Get adaptive flush controller configuration as dict"""
+        return {
+            'enabled': cls.ADAPTIVE_FLUSH_ENABLED,
+            'max_batch': cls.FLUSH_MAX_BATCH,
+            'max_interval': cls.FLUSH_MAX_INTERVAL,
+            'influx': {
+                'latency_slo': cls.INFLUX_LATENCY_SLO_MS / 1000.0,
+                'max_inflight': cls.INFLUX_MAX_INFLIGHT
+            },
+            'aws': {
+                'latency_slo': cls.AWS_LATENCY_SLO_MS / 1000.0,
+                'max_inflight': cls.AWS_MAX_INFLIGHT
+            }
+        }
+    
+    @classmethod
+    def get_memory_config(cls):
+        """Get memory budget configuration as dict"""
+        return {
+            'budget_bytes': int(cls.MEMORY_BUDGET_MB * 1024 * 1024),
+            'rss_limit_bytes': int(cls.MEMORY_RSS_LIMIT_MB * 1024 * 1024),
+            'report_interval': cls.MEMORY_REPORT_INTERVAL,
+            'spill_dir': cls.SPILL_DIR,
+            'spill_max_bytes': int(cls.SPILL_MAX_MB * 1024 * 1024)
+        }
+    
+    @classmethod
+    def get_profiling_config(cls):
+        """Get profiling configuration as dict"""
+        return {
+            'enabled': cls.PROFILING_ENABLED,
+            'trace_file': cls.TRACE_FILE,
+            'trace_max_bytes': cls.TRACE_MAX_BYTES,
+            'trace_backup_count': cls.TRACE_BACKUP_COUNT,
+            'profiler_duration': cls.PROFILER_DURATION,
+            'profiler_interval_ms': cls.PROFILER_INTERVAL_MS,
+            'profiler_on_start': cls.PROFILER_ON_START
         }
     
     @classmethod
@@ -68,6 +206,12 @@ class Config:
             'mqtt_username': cls.MQTT_BROKER_USERNAME,
             'mqtt_password_set': bool(cls.MQTT_BROKER_PASSWORD),
             'mqtt_topic': cls.MQTT_TOPIC,
+            'mqtt_capture_file': cls.MQTT_CAPTURE_FILE,
             'data_location': cls.DATA_LOCATION,
-            'measurement_name': cls.MEASUREMENT_NAME
+            'measurement_name': cls.MEASUREMENT_NAME,
+            'worker_processes': cls.WORKER_PROCESSES,
+            'adaptive_flush_enabled': cls.ADAPTIVE_FLUSH_ENABLED,
+            'memory_budget_mb': cls.MEMORY_BUDGET_MB,
+            'profiling_enabled': cls.PROFILING_ENABLED,
+            'config_file': cls.CONFIG_FILE
         }
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import signal
+import threading
+
+
+class ConfigWatcher:
+    def __init__(self, callback, config_file=None, watch_dirs=(), interval=10.0):
+        """
+        Watch the config file and credential directories and trigger reloads
+        Polls modification times every interval seconds; SIGHUP forces an immediate check.
+        Args:
+            callback: Callable(changed_paths) run on the watcher thread when something changed
+                (changed_paths is empty for a SIGHUP without file changes)
+            config_file: Optional dotenv-style file overlaying the environment
+            watch_dirs: Directories whose files are watched (e.g. AWS IoT certificates)
+            interval: Poll interval in seconds (0 disables polling, SIGHUP still works)
+        """
+        self.callback = callback
+        self.config_file = config_file
+        self.watch_dirs = list(watch_dirs)
+        self.interval = interval
+        self.wakeup = threading.Event()
+        self.forced = False
+        self.running = False
+        self.thread = None
+        self.signatures = self._scan()
+
+    def _scan(self):
+        """Map each watched path to its (mtime, size)"""
+        paths = [self.config_file] if self.config_file else []
+        for directory in self.watch_dirs:
+            if os.path.isdir(directory):
+                paths.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory)))
+
+        signatures = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return signatures
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self.thread.start()
+
+    def install_signal_handler(self):
+        """Reload on SIGHUP; the handler only wakes the watcher thread"""
+        if not hasattr(signal, "SIGHUP"):
+            return False
+        try:
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.trigger())
+            return True
+        except ValueError:
+            # Signal handlers can only be installed from the main thread
+            return False
+
+    def trigger(self):
+        self.forced = True
+        self.wakeup.set()
+
+    def check(self):
+        """Run the callback if any watched file changed (or a reload was forced)"""
+        signatures = self._scan()
+        changed = sorted(
+            path for path in set(signatures) | set(self.signatures)
+            if signatures.get(path) != self.signatures.get(path)
+        )
+        forced, self.forced = self.forced, False
+        self.signatures = signatures
+        if changed or forced:
+            self.callback(changed)
+
+    def _run(self):
+        while self.running:
+            self.wakeup.wait(self.interval if self.interval > 0 else None)
+            self.wakeup.clear()
+            if not self.running:
+                return
+            try:
+                self.check()
+            except Exception as e:
+                print(f"❌ Configuration reload failed: {e}")
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(5.0)
@@ -1,15 +1,58 @@
 import os
-from config import Config
+import math
+import time
+import threading
+from config import Config, ConfigWatcher
 from mqtt.mqttReceiver import MQTTReceiver
 from mqtt.mqttPublisher import AWSIoTPublisher
 from db.influxClient import connect_influxdb
-from db.influxWriter import write_data
+from db.influxWriter import write_data, write_batch
+from db.pendingWrites import PendingWriteBuffer
+from memory.memoryBudget import configure_memory_budget, POLICY_SHED
+from processing.derivedMetrics import DerivedMetricsEngine
+from processing.batchPayload import batch_readings, reading_timestamp
+from pipeline.flushController import AdaptiveFlushController
+from pipeline.sinkBatcher import SinkBatcher, ITEM_SIZE_ESTIMATE
+from profiling import tracer
+from profiling.sampler import SamplingProfiler
+
+# How long a batched AWS flush waits for a credential/location reload to finish
+AWS_RELOAD_WAIT = 30.0
 
 class WeatherDataProcessor:
-    def __init__(self):
-        self.influx_client = None
+    def __init__(self, influx_client=None, aws_publisher=None, worker_index=None, worker_count=1):
+        """
+        Initialize the processing pipeline
+        Args:
+            influx_client: Pre-built InfluxDB client (e.g. a local stand-in); connects from Config if None
+            aws_publisher: Pre-built AWS IoT publisher (e.g. a local stand-in); connects from Config if None
+            worker_index: Index of this worker process in multi-process mode, None otherwise
+            worker_count: Total worker processes sharing the memory budget
+        """
+        self.influx_client = influx_client
         self.mqtt_receiver = None
-        self.aws_publisher = None
+        self.aws_publisher = aws_publisher
+        self.worker_index = worker_index
+        self.profiler = None
+        self.influx_batcher = None
+        self.aws_batcher = None
+        self.credentials_dir = "credentials"
+        self.config_watcher = None
+        self.reload_lock = threading.Lock()
+        self.aws_ready = threading.Event()
+        self.aws_ready.set()
+        self.aws_reconnect_lock = threading.Lock()
+        # Publishes held back while a reload swaps the AWS IoT connection
+        self.aws_held = []
+        self.aws_held_lock = threading.Lock()
+        
+        # Connections built here are rebuilt on reload; injected ones (stand-ins) are kept
+        self.manage_influx = influx_client is None
+        self.manage_aws = aws_publisher is None
+        
+        # Overlay the watched config file, if any, before validating
+        if Config.CONFIG_FILE:
+            Config.reload()
         
         # Validate configuration
         Config.validate()
@@ -18,11 +61,253 @@ class WeatherDataProcessor:
         # Get configurations from centralized Config
         self.influx_config = Config.get_influx_config()
         self.mqtt_config = Config.get_mqtt_config()
+        self.profiling_config = Config.get_profiling_config()
+        self.memory_config = Config.get_memory_config()
+        self.flush_config = Config.get_flush_config()
+        
+        # Worker processes split the memory budget and need their own spill and trace files
+        if worker_index is not None:
+            self.memory_config['budget_bytes'] //= worker_count
+            self.memory_config['spill_dir'] = os.path.join(self.memory_config['spill_dir'], f"worker-{worker_index}")
+            root, ext = os.path.splitext(self.profiling_config['trace_file'])
+            self.profiling_config['trace_file'] = f"{root}.worker-{worker_index}{ext}"
+        
+        # Bound every buffering component before any of them is created
+        self.memory_budget = configure_memory_budget(
+            limit_bytes=self.memory_config['budget_bytes'],
+            rss_limit_bytes=self.memory_config['rss_limit_bytes']
+        )
+        self.last_memory_report = time.monotonic()
+        self.derived_metrics = DerivedMetricsEngine()
+        self.pending_writes = PendingWriteBuffer(
+            spill_dir=self.memory_config['spill_dir'],
+            spill_max_bytes=self.memory_config['spill_max_bytes']
+        )
+        self.aws_held_account = self.memory_budget.register("aws_reload_backlog", POLICY_SHED)
+        
+        # Setup opt-in profiling before any traffic flows
+        self.setup_profiling()
         
         # Setup connections
-        self.setup_influxdb()
-        self.setup_aws_iot()
+        if self.influx_client is None:
+            self.setup_influxdb()
+        if self.aws_publisher is None:
+            self.setup_aws_iot()
+        
+        # Optionally batch sink writes under adaptive flush control
+        self.setup_adaptive_flush()
+        
+        # Apply config file edits, rotated certificates and SIGHUP without restarting
+        self.setup_config_reload()
+        
+    def setup_profiling(self):
+        """Initialize per-message tracing and the on-demand sampling profiler"""
+        if not self.profiling_config['enabled']:
+            return
+        
+        try:
+            tracer.configure_tracer(
+                enabled=True,
+                path=self.profiling_config['trace_file'],
+                max_bytes=self.profiling_config['trace_max_bytes'],
+                backup_count=self.profiling_config['trace_backup_count']
+            )
+            self.profiler = SamplingProfiler(
+                output_dir=os.path.dirname(self.profiling_config['trace_file']) or ".",
+                duration=self.profiling_config['profiler_duration'],
+                interval=self.profiling_config['profiler_interval_ms'] / 1000.0
+            )
+            self.profiler.install_signal_handler()
+            if self.profiling_config['profiler_on_start']:
+                self.profiler.trigger()
+            print("✅ Profiling enabled")
+        except Exception as e:
+            print(f"⚠️ Profiling setup failed (will continue without profiling): {e}")
+            tracer.configure_tracer(enabled=False, path=None, max_bytes=0, backup_count=0)
+    
+    def setup_adaptive_flush(self):
+        """Create one batcher per sink, each tuned by its own AIMD flush controller"""
+        if not self.flush_config['enabled']:
+            return
+        
+        self.influx_batcher = SinkBatcher('influx', self.flush_influx, self.create_flush_controller('influx'))
+        self.aws_batcher = SinkBatcher('aws', self.flush_aws, self.create_flush_controller('aws'))
+        print("✅ Adaptive flush control enabled for InfluxDB and AWS IoT")
+    
+    def create_flush_controller(self, sink):
+        return AdaptiveFlushController(
+            name=sink,
+            latency_slo=self.flush_config[sink]['latency_slo'],
+            max_batch=self.flush_config['max_batch'],
+            max_interval=self.flush_config['max_interval'],
+            max_inflight=self.flush_config[sink]['max_inflight']
+        )
+    
+    def setup_config_reload(self):
+        """Watch CONFIG_FILE and the AWS IoT credentials, and reload on SIGHUP"""
+        watch_dirs = [self.credentials_dir] if self.manage_aws else []
+        self.config_watcher = ConfigWatcher(
+            callback=self.reload_config,
+            config_file=Config.CONFIG_FILE,
+            watch_dirs=watch_dirs,
+            interval=Config.CONFIG_WATCH_INTERVAL
+        )
+        if self.config_watcher.install_signal_handler():
+            print("✅ Configuration reload enabled (SIGHUP)")
+        self.config_watcher.start()
+    
+    def reload_config(self, changed_paths=()):
+        """
+        Re-read the configuration and apply what changed while ingestion keeps running
+        Runs on the watcher thread. Message handling only ever reads the current
+        influx_config dict and publisher reference, so each swap below is atomic.
+        """
+        with self.reload_lock:
+            changes = Config.reload()
+            credentials_dir = os.path.abspath(self.credentials_dir)
+            credentials_changed = any(
+                os.path.dirname(os.path.abspath(path)) == credentials_dir for path in changed_paths
+            )
+            if not changes and not credentials_changed:
+                print("Configuration reloaded, nothing changed")
+                return
+            for name, (old, new) in changes.items():
+                if name == 'INFLUXDB_TOKEN':
+                    old, new = "***", "***"
+                print(f"Configuration change: {name}: {old} -> {new}")
+            
+            # InfluxDB: new endpoint/credentials need a new client, bucket and tags only a new dict
+            influx_config = Config.get_influx_config()
+            connection_keys = ('url', 'token', 'org')
+            if self.manage_influx and any(influx_config[k] != self.influx_config[k] for k in connection_keys):
+                self.reload_influxdb(influx_config)
+            else:
+                self.influx_config = influx_config
+            
+            # MQTT: move the subscription over on the live connection
+            if 'MQTT_TOPIC' in changes:
+                self.mqtt_config = dict(self.mqtt_config, topic=Config.MQTT_TOPIC)
+                if self.mqtt_receiver:
+                    self.mqtt_receiver.update_topic(Config.MQTT_TOPIC)
+            
+            # AWS IoT: rotated certificates or a new location (publish topic) need a new connection
+            if self.manage_aws and (credentials_changed or 'DATA_LOCATION' in changes):
+                self.reload_aws_iot()
+    
+    def reload_influxdb(self, influx_config):
+        """Connect a client with the new settings, swap it in, then close the old one"""
+        print(f"Reconnecting to InfluxDB at {influx_config['url']}")
+        try:
+            client = connect_influxdb(
+                url=influx_config['url'],
+                token=influx_config['token'],
+                org=influx_config['org']
+            )
+        except Exception as e:
+            client = None
+            print(f"❌ Error connecting to InfluxDB: {e}")
+        if not client:
+            print("⚠️ Keeping the current InfluxDB connection")
+            return
+        
+        old_client = self.influx_client
+        self.influx_config = influx_config
+        self.influx_client = client
+        print("✅ Switched to the new InfluxDB connection")
+        
+        # A write racing the swap fails on the closed client and is queued for retry
+        if old_client:
+            try:
+                old_client.close()
+            except Exception as e:
+                print(f"⚠️ Error closing previous InfluxDB client: {e}")
+    
+    def reload_aws_iot(self, drain_timeout=10.0):
+        """Reconnect AWS IoT with the current certificates and location"""
+        print("Reloading AWS IoT connection...")
+        client_id_suffix = f"-w{self.worker_index}" if self.worker_index is not None else ""
+        try:
+            # Fails early on missing or unreadable certificates, leaving the old connection alone
+            publisher = AWSIoTPublisher(
+                credentials_dir=self.credentials_dir,
+                client_id_suffix=client_id_suffix,
+                data_location=self.influx_config['location']
+            )
+            if not publisher.validate_certificates():
+                raise Exception("Certificate validation failed")
+        except Exception as e:
+            print(f"❌ AWS IoT reload failed (keeping current connection): {e}")
+            return
         
+        # Both connections share a client ID, and AWS IoT drops the older one when the new
+        # one connects (which would then auto-reconnect and drop the new one). Hold publishes,
+        # let in-flight ones finish, and only then hand over.
+        self.aws_ready.clear()
+        self.aws_reconnect_lock.acquire()
+        try:
+            old_publisher = self.aws_publisher
+            if old_publisher:
+                deadline = time.monotonic() + drain_timeout
+                while old_publisher.inflight_count and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                old_publisher.disconnect()
+            
+            if publisher.connect():
+                self.aws_publisher = publisher
+                print("✅ AWS IoT reconnected with the new configuration")
+            elif old_publisher and old_publisher.connect():
+                print("⚠️ AWS IoT reload failed, reconnected with the previous configuration")
+            else:
+                print("❌ AWS IoT reload failed, will retry on the next publish")
+                self.aws_publisher = old_publisher or publisher
+        except Exception as e:
+            print(f"❌ AWS IoT reload error: {e}")
+        finally:
+            self.aws_reconnect_lock.release()
+            with self.aws_held_lock:
+                self.aws_ready.set()
+                held, self.aws_held = self.aws_held, []
+            self.replay_held_publishes(held)
+    
+    def hold_for_aws_reload(self, readings, timestamps, location):
+        """
+        Keep readings for AWS IoT while a reload swaps the connection
+        Returns None if no reload is running (publish normally), else whether they were held
+        """
+        with self.aws_held_lock:
+            if self.aws_ready.is_set():
+                return None
+            if not self.aws_held_account.reserve(ITEM_SIZE_ESTIMATE * len(readings)):
+                self.aws_held_account.record_shed()
+                print("⚠️ Memory budget reached, dropping reading held for AWS IoT reload")
+                return False
+            self.aws_held.append((readings, timestamps, location))
+        print(f"AWS IoT connection is being reloaded, holding {len(readings)} reading(s)")
+        return True
+    
+    def replay_held_publishes(self, held):
+        """Publish readings held during an AWS IoT reload, oldest first"""
+        if not held:
+            return
+        print(f"Publishing {len(held)} message(s) held during the AWS IoT reload")
+        for readings, timestamps, location in held:
+            self.aws_held_account.release(ITEM_SIZE_ESTIMATE * len(readings))
+            if not self.aws_publisher or not self.ensure_aws_connection():
+                print("⚠️ AWS IoT connection unavailable, skipping held publish")
+                continue
+            if len(readings) == 1:
+                self.aws_publisher.publish_weather_data(
+                    weather_data=readings[0],
+                    location=location,
+                    timestamp=timestamps[0]
+                )
+            else:
+                self.aws_publisher.publish_weather_batch(
+                    readings=readings,
+                    timestamps=timestamps,
+                    location=location
+                )
+    
     def setup_influxdb(self):
         """Initialize InfluxDB connection"""
         try:
@@ -44,7 +329,13 @@ class WeatherDataProcessor:
         """Initialize AWS IoT connection"""
         try:
             print("Setting up AWS IoT connection...")
-            self.aws_publisher = AWSIoTPublisher(credentials_dir="credentials")
+            # Each worker process needs its own MQTT client id, or AWS IoT disconnects the others
+            client_id_suffix = f"-w{self.worker_index}" if self.worker_index is not None else ""
+            self.aws_publisher = AWSIoTPublisher(
+                credentials_dir=self.credentials_dir,
+                client_id_suffix=client_id_suffix,
+                data_location=self.influx_config['location']
+            )
             
             if self.aws_publisher.connect():
                 print("✅ AWS IoT connection established")
@@ -57,27 +348,48 @@ class WeatherDataProcessor:
     
     def process_weather_data(self, data):
         """Process and store weather data received from MQTT"""
+        # Devices that buffered offline or sample fast send many readings per message
+        readings = batch_readings(data)
+        if readings is not None:
+            return self.process_weather_batch(readings)
+        
         try:
             print(f"Processing weather data: {data}")
             
             # Validate data structure
-            if not self.validate_weather_data(data):
+            with tracer.span("validate_weather_data"):
+                valid = self.validate_weather_data(data)
+            if not valid:
                 print("⚠️ Invalid weather data format")
                 return False
             
+            # Compute derived metrics once, before fanning out to the sinks
+            timestamp = reading_timestamp(data, time.time())
+            with tracer.span("derived_metrics"):
+                self.derived_metrics.enrich(data, timestamp)
+            
+            if self.influx_batcher:
+                return self.enqueue_readings([data], [timestamp])
+            
+            # Read once so a concurrent config reload cannot mix old and new settings
+            influx_config = self.influx_config
+            
             # Initialize success flags
             influx_success = False
             aws_success = False
             
             # Write to InfluxDB
             if self.influx_client:
-                influx_success = write_data(
-                    client=self.influx_client,
-                    bucket=self.influx_config['bucket'],
-                    measurement=Config.MEASUREMENT_NAME,
-                    data=data,
-                    location=Config.DATA_LOCATION
-                )
+                with tracer.span("write_data"):
+                    influx_success = write_data(
+                        client=self.influx_client,
+                        bucket=influx_config['bucket'],
+                        measurement=influx_config['measurement'],
+                        data=data,
+                        location=influx_config['location'],
+                        pending=self.pending_writes,
+                        timestamp=timestamp
+                    )
                 if influx_success:
                     print("✅ Weather data successfully stored in InfluxDB")
                 else:
@@ -86,28 +398,18 @@ class WeatherDataProcessor:
                 print("❌ InfluxDB client not available")
             
             # Publish to AWS IoT Cloud
-            if self.aws_publisher:
-                # Check connection and attempt reconnect if needed
-                if not self.aws_publisher.is_connection_healthy():
-                    print("AWS IoT connection lost, attempting reconnect...")
-                    try:
-                        # Add a small delay before reconnecting
-                        import time
-                        time.sleep(2)
-                        
-                        if self.aws_publisher.connect():
-                            print("✅ AWS IoT reconnected successfully")
-                        else:
-                            print("❌ AWS IoT reconnection failed")
-                    except Exception as e:
-                        print(f"❌ AWS IoT reconnection error: {e}")
-                
+            held = self.hold_for_aws_reload([data], [timestamp], influx_config['location'])
+            if held is not None:
+                aws_success = held
+            elif self.aws_publisher:
                 # Try to publish if connected
-                if self.aws_publisher.is_connection_healthy():
-                    aws_success = self.aws_publisher.publish_weather_data(
-                        weather_data=data,
-                        location=Config.DATA_LOCATION
-                    )
+                if self.ensure_aws_connection():
+                    with tracer.span("publish_weather_data"):
+                        aws_success = self.aws_publisher.publish_weather_data(
+                            weather_data=data,
+                            location=influx_config['location'],
+                            timestamp=timestamp
+                        )
                     if aws_success:
                         print("✅ Weather data successfully published to AWS IoT")
                     else:
@@ -124,12 +426,197 @@ class WeatherDataProcessor:
             else:
                 print("❌ All data storage/publishing attempts failed")
             
+            self.maybe_report_status()
             return overall_success
                 
         except Exception as e:
             print(f"❌ Error processing weather data: {e}")
             return False
     
+    def process_weather_batch(self, readings):
+        """Validate a batch of readings and store it with one bulk operation per destination"""
+        try:
+            print(f"Processing batch of {len(readings)} weather readings")
+            
+            # Keep valid readings only, oldest first so trend metrics see them in order.
+            # Batch readings must carry their own Timestamp: points sharing one timestamp
+            # (and tag set) would overwrite each other in InfluxDB.
+            with tracer.span("validate_weather_data", batch=len(readings)):
+                timestamped = [
+                    (reading_timestamp(r, None), r) for r in readings
+                    if isinstance(r, dict) and self.validate_weather_data(r)
+                ]
+                valid_count = len(timestamped)
+                timestamped = [(t, r) for t, r in timestamped if t is not None]
+            if valid_count < len(readings):
+                print(f"⚠️ Dropped {len(readings) - valid_count} invalid readings from batch")
+            if len(timestamped) < valid_count:
+                print(f"⚠️ Dropped {valid_count - len(timestamped)} batch readings without a valid Timestamp")
+            if not timestamped:
+                print("⚠️ No valid readings in batch")
+                return False
+            
+            timestamped.sort(key=lambda item: item[0])
+            timestamps = [t for t, _ in timestamped]
+            valid = [r for _, r in timestamped]
+            
+            with tracer.span("derived_metrics", batch=len(valid)):
+                self.derived_metrics.enrich_batch(valid, timestamps)
+            
+            if self.influx_batcher:
+                return self.enqueue_readings(valid, timestamps)
+            
+            influx_config = self.influx_config
+            influx_success = False
+            aws_success = False
+            
+            # Write all points to InfluxDB in one request
+            if self.influx_client:
+                with tracer.span("write_data", batch=len(valid)):
+                    influx_success = write_batch(
+                        client=self.influx_client,
+                        bucket=influx_config['bucket'],
+                        measurement=influx_config['measurement'],
+                        readings=valid,
+                        timestamps=timestamps,
+                        location=influx_config['location'],
+                        pending=self.pending_writes
+                    )
+            else:
+                print("❌ InfluxDB client not available")
+            
+            # Publish the batch to AWS IoT
+            held = self.hold_for_aws_reload(valid, timestamps, influx_config['location'])
+            if held is not None:
+                aws_success = held
+            elif self.aws_publisher:
+                if self.ensure_aws_connection():
+                    with tracer.span("publish_weather_data", batch=len(valid)):
+                        aws_success = self.aws_publisher.publish_weather_batch(
+                            readings=valid,
+                            timestamps=timestamps,
+                            location=influx_config['location']
+                        )
+                else:
+                    print("⚠️ AWS IoT connection unavailable, skipping cloud publish")
+            else:
+                print("⚠️ AWS IoT publisher not initialized, skipping cloud publish")
+            
+            overall_success = influx_success or aws_success
+            if overall_success:
+                print(f"✅ Batch of {len(valid)} readings processed successfully")
+            else:
+                print("❌ All batch storage/publishing attempts failed")
+            
+            self.maybe_report_status()
+            return overall_success
+            
+        except Exception as e:
+            print(f"❌ Error processing weather batch: {e}")
+            return False
+    
+    def enqueue_readings(self, readings, timestamps):
+        """Hand readings to the sink batchers; they are flushed in the background"""
+        queued = False
+        for batcher in (self.influx_batcher, self.aws_batcher):
+            for item in zip(readings, timestamps):
+                queued = batcher.submit(item) or queued
+        print(f"✅ {len(readings)} reading(s) queued for adaptive flush")
+        self.maybe_report_status()
+        return queued
+    
+    def flush_influx(self, items, on_complete):
+        """Batcher flush: write queued readings to InfluxDB in one request"""
+        if not self.influx_client:
+            print("❌ InfluxDB client not available")
+            on_complete(False)
+            return
+        
+        influx_config = self.influx_config
+        with tracer.span("write_data", batch=len(items)):
+            ok = write_batch(
+                client=self.influx_client,
+                bucket=influx_config['bucket'],
+                measurement=influx_config['measurement'],
+                readings=[reading for reading, _ in items],
+                timestamps=[timestamp for _, timestamp in items],
+                location=influx_config['location'],
+                pending=self.pending_writes
+            )
+        on_complete(ok)
+    
+    def flush_aws(self, items, on_complete):
+        """Batcher flush: publish queued readings to AWS IoT; completes with the publish future"""
+        # Hold the batch while a reload swaps the AWS IoT connection instead of failing it
+        if not self.aws_publisher or not self.ensure_aws_connection(wait=AWS_RELOAD_WAIT):
+            print("⚠️ AWS IoT connection unavailable, skipping cloud publish")
+            on_complete(False)
+            return
+        
+        location = self.influx_config['location']
+        with tracer.span("publish_weather_data", batch=len(items)):
+            if len(items) == 1:
+                # Single readings keep the original single-reading message shape
+                published = self.aws_publisher.publish_weather_data(
+                    weather_data=items[0][0],
+                    location=location,
+                    on_complete=on_complete,
+                    timestamp=items[0][1]
+                )
+            else:
+                published = self.aws_publisher.publish_weather_batch(
+                    readings=[reading for reading, _ in items],
+                    timestamps=[timestamp for _, timestamp in items],
+                    location=location,
+                    on_complete=on_complete
+                )
+        if not published:
+            on_complete(False)
+    
+    def get_flush_decisions(self):
+        """Current limits and recent AIMD decisions of each sink's flush controller"""
+        return {
+            batcher.name: dict(batcher.controller.snapshot(), queued=batcher.pending())
+            for batcher in (self.influx_batcher, self.aws_batcher) if batcher
+        }
+    
+    def print_flush_report(self):
+        for name, state in self.get_flush_decisions().items():
+            print(f"Flush {name}: batch {state['batch_size']}, interval {state['flush_interval_s']}s, "
+                  f"in-flight {state['inflight_limit']}, latency {state['latency_ewma_ms']}ms "
+                  f"(SLO {state['latency_slo_ms']}ms), error rate {state['error_rate']}, queued {state['queued']}")
+    
+    def ensure_aws_connection(self, wait=0):
+        """Check the AWS IoT connection and attempt a reconnect if needed"""
+        # A config reload is replacing the connection; never race it with a reconnect
+        if not self.aws_ready.wait(wait):
+            print("⚠️ AWS IoT connection is being reloaded")
+            return False
+        
+        if not self.aws_publisher.is_connection_healthy():
+            # Flush threads share one client ID; concurrent connects would knock each other off
+            if not self.aws_reconnect_lock.acquire(blocking=False):
+                # Another thread is reconnecting, use its outcome instead of retrying
+                with self.aws_reconnect_lock:
+                    pass
+                return self.aws_publisher.is_connection_healthy()
+            
+            print("AWS IoT connection lost, attempting reconnect...")
+            try:
+                # Add a small delay before reconnecting
+                time.sleep(2)
+                
+                if self.aws_publisher.connect():
+                    print("✅ AWS IoT reconnected successfully")
+                else:
+                    print("❌ AWS IoT reconnection failed")
+            except Exception as e:
+                print(f"❌ AWS IoT reconnection error: {e}")
+            finally:
+                self.aws_reconnect_lock.release()
+        
+        return self.aws_publisher.is_connection_healthy()
+    
     def validate_weather_data(self, data):
         """Validate weather data structure"""
         required_fields = [
@@ -142,8 +629,33 @@ class WeatherDataProcessor:
         if missing_fields:
             print(f"⚠️ Missing required fields: {missing_fields}")
             return False
+        
+        # Every field is stored as a number; null, text or NaN would fail later for the whole batch
+        invalid_fields = [field for field in required_fields if not self._is_number(data[field])]
+        if invalid_fields:
+            print(f"⚠️ Non-numeric required fields: {invalid_fields}")
+            return False
         return True
     
+    def _is_number(self, value):
+        if isinstance(value, bool):
+            return False
+        try:
+            return math.isfinite(float(value))
+        except (TypeError, ValueError):
+            return False
+    
+    def maybe_report_status(self):
+        """Print memory usage and flush controller state every MEMORY_REPORT_INTERVAL seconds"""
+        now = time.monotonic()
+        if now - self.last_memory_report >= self.memory_config['report_interval']:
+            self.last_memory_report = now
+            self.memory_budget.print_report()
+            self.print_flush_report()
+    
+    def get_memory_report(self):
+        return self.memory_budget.report()
+    
     def get_config_summary(self):
         return Config.print_config_summary()
     
@@ -178,6 +690,20 @@ class WeatherDataProcessor:
         """Gracefully shutdown all connections"""
         print("Shutting down connections...")
         
+        # No reloads while connections are torn down
+        if self.config_watcher:
+            self.config_watcher.stop()
+        
+        # Stop MQTT receiver (and any traffic capture)
+        if self.mqtt_receiver:
+            self.mqtt_receiver.close()
+        
+        # Flush anything still queued while the sinks are connected
+        for batcher in (self.influx_batcher, self.aws_batcher):
+            if batcher:
+                batcher.close()
+        self.print_flush_report()
+        
         # Disconnect AWS IoT
         if self.aws_publisher:
             self.aws_publisher.disconnect()
@@ -190,6 +716,13 @@ class WeatherDataProcessor:
             except Exception as e:
                 print(f"⚠️ Error closing InfluxDB: {e}")
         
+        # Keep unsent writes on disk for the next run and report final buffer usage
+        self.pending_writes.spill_all()
+        self.memory_budget.print_report()
+        
+        # Flush and close the trace file
+        tracer.get_tracer().close()
+        
         print("✅ Shutdown complete")
 
 if __name__ == "__main__":
@@ -1,8 +1,31 @@
 import time
 from influxdb_client import Point, WritePrecision
 from .influxClient import get_write_api
+from processing.derivedMetrics import DERIVED_FIELDS
 
-def write_data(client, bucket, measurement, data, location=None):
+def build_point(measurement, data, location, timestamp_ns):
+    """Build an InfluxDB Point from a validated weather reading"""
+    point = (
+        Point(measurement)
+        .tag("location", location)
+        .field("temperature", float(data.get("Temperature", 0)))
+        .field("humidity", float(data.get("Humidity", 0)))
+        .field("pressure", float(data.get("Barometric Pressure", 0)))
+        .field("wind_direction", int(data.get("Wind Direction", 0)))
+        .field("avg_wind_speed", float(data.get("Avg Wind Speed", 0)))
+        .field("max_wind_speed", float(data.get("Max Wind Speed", 0)))
+        .field("rainfall_1hr", float(data.get("Rainfall (1hr)", 0)))
+        .field("rainfall_24hr", float(data.get("Rainfall (24hr)", 0)))
+        .time(timestamp_ns, WritePrecision.NS)
+    )
+    
+    # Derived metrics are only present once enough history is available
+    for name, (field, _) in DERIVED_FIELDS.items():
+        if name in data:
+            point.field(field, float(data[name]))
+    return point
+
+def write_data(client, bucket, measurement, data, location=None, pending=None, timestamp=None):
     write_api = get_write_api(client)
     
     if not location:
@@ -13,25 +36,60 @@ def write_data(client, bucket, measurement, data, location=None):
         print("❌ Failed to get write API")
         return False
     
+    point = None
     try:
-        point = (
-            Point(measurement)
-            .tag("location", location)
-            .field("temperature", float(data.get("Temperature", 0)))
-            .field("humidity", float(data.get("Humidity", 0)))
-            .field("pressure", float(data.get("Barometric Pressure", 0)))
-            .field("wind_direction", int(data.get("Wind Direction", 0)))
-            .field("avg_wind_speed", float(data.get("Avg Wind Speed", 0)))
-            .field("max_wind_speed", float(data.get("Max Wind Speed", 0)))
-            .field("rainfall_1hr", float(data.get("Rainfall (1hr)", 0)))
-            .field("rainfall_24hr", float(data.get("Rainfall (24hr)", 0)))
-            .time(time.time_ns(), WritePrecision.NS)
-        )
+        timestamp_ns = int(timestamp * 1e9) if timestamp is not None else time.time_ns()
+        point = build_point(measurement, data, location, timestamp_ns)
         
         write_api.write(bucket=bucket, record=point)
         print(f"✅ Data written to InfluxDB: {measurement}")
+        
+        # The database is reachable again, retry anything queued during an outage
+        if pending is not None:
+            pending.drain(write_api, bucket)
         return True
         
     except Exception as e:
         print(f"❌ Failed to write data to InfluxDB: {e}")
+        if pending is not None and point is not None:
+            pending.add(point.to_line_protocol())
+            print("⚠️ Write queued for retry")
+        return False
+
+def write_batch(client, bucket, measurement, readings, timestamps, location=None, pending=None):
+    """Write a batch of readings (epoch-second timestamps) in a single request"""
+    write_api = get_write_api(client)
+    
+    if not location:
+        from config import Config
+        location = Config.DATA_LOCATION
+    
+    if not write_api:
+        print("❌ Failed to get write API")
+        return False
+    
+    # Build points one at a time so a single bad reading cannot lose the rest of the batch
+    points = []
+    for data, timestamp in zip(readings, timestamps):
+        try:
+            points.append(build_point(measurement, data, location, int(timestamp * 1e9)))
+        except Exception as e:
+            print(f"⚠️ Skipping reading that cannot be written to InfluxDB: {e}")
+    if not points:
+        return False
+    
+    try:
+        write_api.write(bucket=bucket, record=points)
+        print(f"✅ Batch of {len(points)} points written to InfluxDB: {measurement}")
+        
+        if pending is not None:
+            pending.drain(write_api, bucket)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Failed to write batch to InfluxDB: {e}")
+        if pending is not None and points:
+            for point in points:
+                pending.add(point.to_line_protocol())
+            print(f"⚠️ {len(points)} writes queued for retry")
         return False
\ No newline at end of file
@@ -0,0 +1,151 @@
+import os
+import threading
+from collections import deque
+from memory.memoryBudget import get_memory_budget, POLICY_SPILL
+
+
+class PendingWriteBuffer:
+    def __init__(self, spill_dir="spill", spill_max_bytes=256 * 1024 * 1024, drain_chunk=1000, drain_chunks_per_call=5):
+        """
+        Hold InfluxDB writes that failed so they can be retried later
+        Points are kept as line protocol in memory while the memory budget allows,
+        then appended to a spill file on disk.
+        Args:
+            spill_dir: Directory for the on-disk spill file
+            spill_max_bytes: Spill file size after which new points are shed
+            drain_chunk: Points written per request while draining
+            drain_chunks_per_call: Requests a single drain() may make, so the backlog is
+                worked off across successful writes instead of stalling one of them
+        """
+        self.spill_path = os.path.join(spill_dir, "pending-writes.lp")
+        self.spill_max_bytes = spill_max_bytes
+        self.drain_chunk = drain_chunk
+        self.drain_chunks_per_call = drain_chunks_per_call
+        self.lines = deque()
+        self.lock = threading.Lock()
+        # Only one caller drains at a time; the others skip instead of waiting
+        self.drain_lock = threading.Lock()
+        # Bytes at the start of the spill file that have already been written back
+        self.spill_offset = 0
+        self.account = get_memory_budget().register("influx_pending_writes", POLICY_SPILL)
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def has_spilled(self):
+        return os.path.exists(self.spill_path) and os.path.getsize(self.spill_path) > 0
+
+    def add(self, line):
+        """Queue a line protocol record for retry"""
+        size = len(line)
+        with self.lock:
+            if self.account.reserve(size):
+                self.lines.append(line)
+                return
+            self._spill([line])
+
+    def _spill(self, lines):
+        spilled_size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+        if spilled_size >= self.spill_max_bytes:
+            self.account.record_shed(len(lines))
+            print(f"⚠️ Spill file full, dropped {len(lines)} pending InfluxDB write(s)")
+            return
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        self.account.record_spill(len(lines))
+
+    def spill_all(self):
+        """Move everything held in memory to the spill file (e.g. on shutdown)"""
+        with self.drain_lock:
+            self._compact_spill_file()
+            with self.lock:
+                if not self.lines:
+                    return
+                lines = list(self.lines)
+                self.lines.clear()
+                self.account.release(sum(len(line) for line in lines))
+                self._spill(lines)
+                print(f"Spilled {len(lines)} pending InfluxDB write(s) to {self.spill_path}")
+
+    def drain(self, write_api, bucket):
+        """
+        Retry up to drain_chunks_per_call chunks of queued writes, memory first, then the
+        spill file. Stops at the first failure; returns True once nothing is left.
+        """
+        if not self.lines and not self.has_spilled():
+            return True
+        if not self.drain_lock.acquire(blocking=False):
+            return False
+
+        try:
+            for _ in range(self.drain_chunks_per_call):
+                with self.lock:
+                    chunk = [self.lines[i] for i in range(min(self.drain_chunk, len(self.lines)))]
+                if chunk:
+                    # Write without holding the lock so failed writes can still be queued meanwhile
+                    if not self._write_chunk(write_api, bucket, chunk):
+                        return False
+                    with self.lock:
+                        for _ in chunk:
+                            self.lines.popleft()
+                    self.account.release(sum(len(line) for line in chunk))
+                    print(f"✅ Flushed {len(chunk)} pending InfluxDB write(s)")
+                    continue
+
+                if not self.has_spilled():
+                    return True
+                if not self._drain_spill_chunk(write_api, bucket):
+                    return False
+            return not self.lines and not self.has_spilled()
+        finally:
+            self.drain_lock.release()
+
+    def _drain_spill_chunk(self, write_api, bucket):
+        """Write the next chunk of the spill file and advance the drained offset"""
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            f.seek(self.spill_offset)
+            chunk = []
+            while len(chunk) < self.drain_chunk:
+                line = f.readline()
+                if not line:
+                    break
+                chunk.append(line.rstrip("\n"))
+            offset = f.tell()
+
+        if chunk and not self._write_chunk(write_api, bucket, chunk):
+            return False
+        self.spill_offset = offset
+        print(f"✅ Drained {len(chunk)} spilled InfluxDB write(s) from disk")
+
+        with self.lock:
+            # New spills are appended under the lock, so this only removes a fully drained file
+            if self.spill_offset >= os.path.getsize(self.spill_path):
+                os.remove(self.spill_path)
+                self.spill_offset = 0
+        return True
+
+    def _compact_spill_file(self):
+        """Drop the already drained head of the spill file so a restart does not resend it"""
+        if not self.spill_offset or not os.path.exists(self.spill_path):
+            return
+        remaining_path = self.spill_path + ".remaining"
+        with self.lock:
+            with open(self.spill_path, "r", encoding="utf-8") as f, \
+                    open(remaining_path, "w", encoding="utf-8") as rest:
+                f.seek(self.spill_offset)
+                for line in f:
+                    rest.write(line)
+            os.replace(remaining_path, self.spill_path)
+            self.spill_offset = 0
+
+    def _write_chunk(self, write_api, bucket, chunk):
+        try:
+            write_api.write(bucket=bucket, record=chunk)
+            return True
+        except Exception as e:
+            print(f"⚠️ Pending InfluxDB writes still failing: {e}")
+            return False
@@ -0,0 +1,166 @@
+import os
+import time
+import threading
+
+POLICY_SHED = "shed"    # Drop new data when the budget is exhausted
+POLICY_SPILL = "spill"  # Move data to disk when the budget is exhausted
+POLICY_FIXED = "fixed"  # Fixed-size structure, reported but never refused
+
+
+def current_rss():
+    """Resident set size of this process in bytes (0 if unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak RSS in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+
+class BudgetAccount:
+    def __init__(self, budget, name, policy):
+        """Usage accounting for one buffering component"""
+        self.budget = budget
+        self.name = name
+        self.policy = policy
+        self.used = 0
+        self.peak = 0
+        self.shed_count = 0
+        self.spill_count = 0
+
+    def reserve(self, nbytes):
+        """Reserve nbytes from the global budget; False means apply this component's policy"""
+        return self.budget._reserve(self, nbytes)
+
+    def release(self, nbytes):
+        self.budget._release(self, nbytes)
+
+    def set_usage(self, nbytes):
+        """Report the current size of a fixed or externally measured structure"""
+        self.budget._set_usage(self, nbytes)
+
+    def record_shed(self, count=1):
+        with self.budget.lock:
+            self.shed_count += count
+
+    def record_spill(self, count=1):
+        with self.budget.lock:
+            self.spill_count += count
+
+
+class MemoryBudget:
+    def __init__(self, limit_bytes=64 * 1024 * 1024, rss_limit_bytes=0, rss_check_interval=1.0, spill_share=0.5):
+        """
+        Global memory budget shared by every buffering component
+        Args:
+            limit_bytes: Total bytes all registered buffers may hold
+            rss_limit_bytes: Optional process RSS ceiling; 0 disables the RSS check
+            rss_check_interval: Seconds between RSS samples when the RSS ceiling is set
+            spill_share: Fraction of the budget a single spill-policy component may hold.
+                Spilling components have somewhere else to put data, so they go to disk
+                early instead of starving the shed-policy buffers of healthy sinks.
+        """
+        self.limit_bytes = limit_bytes
+        self.rss_limit_bytes = rss_limit_bytes
+        self.spill_share = spill_share
+        self.rss_check_interval = rss_check_interval
+        self.lock = threading.Lock()
+        self.accounts = {}
+        self.total_used = 0
+        self.last_rss = 0
+        self.last_rss_check = 0.0
+
+    def register(self, name, policy=POLICY_SHED):
+        """Register a buffering component and return its BudgetAccount"""
+        with self.lock:
+            account = self.accounts.get(name)
+            if account is None:
+                account = BudgetAccount(self, name, policy)
+                self.accounts[name] = account
+            return account
+
+    def _rss_exceeded(self):
+        if not self.rss_limit_bytes:
+            return False
+        now = time.monotonic()
+        if now - self.last_rss_check >= self.rss_check_interval:
+            self.last_rss = current_rss()
+            self.last_rss_check = now
+        return self.last_rss > self.rss_limit_bytes
+
+    def _reserve(self, account, nbytes):
+        with self.lock:
+            if self.total_used + nbytes > self.limit_bytes or self._rss_exceeded():
+                return False
+            if account.policy == POLICY_SPILL and account.used + nbytes > self.limit_bytes * self.spill_share:
+                return False
+            account.used += nbytes
+            account.peak = max(account.peak, account.used)
+            self.total_used += nbytes
+            return True
+
+    def _release(self, account, nbytes):
+        with self.lock:
+            nbytes = min(nbytes, account.used)
+            account.used -= nbytes
+            self.total_used -= nbytes
+
+    def _set_usage(self, account, nbytes):
+        with self.lock:
+            self.total_used += nbytes - account.used
+            account.used = nbytes
+            account.peak = max(account.peak, nbytes)
+
+    def available(self):
+        with self.lock:
+            return max(0, self.limit_bytes - self.total_used)
+
+    def report(self):
+        """Snapshot of RSS and per-component usage"""
+        rss = current_rss()
+        with self.lock:
+            return {
+                'rss_bytes': rss,
+                'rss_limit_bytes': self.rss_limit_bytes,
+                'budget_bytes': self.limit_bytes,
+                'budget_used_bytes': self.total_used,
+                'components': {
+                    name: {
+                        'policy': account.policy,
+                        'used_bytes': account.used,
+                        'peak_bytes': account.peak,
+                        'shed': account.shed_count,
+                        'spilled': account.spill_count
+                    }
+                    for name, account in self.accounts.items()
+                }
+            }
+
+    def print_report(self):
+        report = self.report()
+        print(f"Memory: RSS {report['rss_bytes'] / 1048576:.1f} MiB, "
+              f"buffers {report['budget_used_bytes'] / 1048576:.2f}/{report['budget_bytes'] / 1048576:.0f} MiB")
+        for name, usage in report['components'].items():
+            print(f"   {name} ({usage['policy']}): {usage['used_bytes']} bytes, "
+                  f"peak {usage['peak_bytes']}, shed {usage['shed']}, spilled {usage['spilled']}")
+        return report
+
+
+_budget = MemoryBudget()
+
+
+def configure_memory_budget(limit_bytes, rss_limit_bytes=0):
+    """Set the process-wide budget limits; registered accounts are kept"""
+    with _budget.lock:
+        _budget.limit_bytes = limit_bytes
+        _budget.rss_limit_bytes = rss_limit_bytes
+    return _budget
+
+
+def get_memory_budget():
+    return _budget
@@ -0,0 +1,97 @@
+import os
+import time
+import struct
+import threading
+
+# Capture file layout:
+#   header:  MAGIC
+#   records: RECORD header followed by the topic (UTF-8) and the raw payload bytes
+MAGIC = b"WECAP\x01"
+RECORD = struct.Struct("<dBBHI")  # receive time, qos, flags, topic length, payload length
+
+FLAG_DUP = 0x01
+FLAG_RETAIN = 0x02
+
+
+class CaptureRecord:
+    __slots__ = ("timestamp", "topic", "payload", "qos", "dup", "retain")
+
+    def __init__(self, timestamp, topic, payload, qos=0, dup=False, retain=False):
+        self.timestamp = timestamp
+        self.topic = topic
+        self.payload = payload
+        self.qos = qos
+        self.dup = dup
+        self.retain = retain
+
+
+class CaptureWriter:
+    def __init__(self, path, flush_interval=1.0):
+        """
+        Append raw MQTT messages to a compact binary capture file
+        Args:
+            path: Capture file path (appended to if it already exists)
+            flush_interval: Seconds between flushes to disk
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.count = 0
+        self.last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        if new_file:
+            self.file.write(MAGIC)
+        print(f"Capturing MQTT traffic to {path}")
+
+    def write(self, topic, payload, timestamp=None, qos=0, dup=False, retain=False):
+        topic_bytes = topic.encode("utf-8")
+        flags = (FLAG_DUP if dup else 0) | (FLAG_RETAIN if retain else 0)
+        header = RECORD.pack(
+            timestamp if timestamp is not None else time.time(),
+            qos, flags, len(topic_bytes), len(payload)
+        )
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(header)
+            self.file.write(topic_bytes)
+            self.file.write(payload)
+            self.count += 1
+            now = time.monotonic()
+            if now - self.last_flush >= self.flush_interval:
+                self.file.flush()
+                self.last_flush = now
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+                print(f"✅ Capture closed: {self.count} messages written to {self.path}")
+
+
+def read_capture(path):
+    """Yield CaptureRecord objects from a capture file in recorded order"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a weather-edge capture file: {path}")
+
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return  # End of file (or a record truncated by an unclean shutdown)
+            timestamp, qos, flags, topic_len, payload_len = RECORD.unpack(header)
+            topic = f.read(topic_len)
+            payload = f.read(payload_len)
+            if len(topic) < topic_len or len(payload) < payload_len:
+                return
+            yield CaptureRecord(
+                timestamp, topic.decode("utf-8"), payload, qos,
+                bool(flags & FLAG_DUP), bool(flags & FLAG_RETAIN)
+            )
@@ -6,20 +6,35 @@ from datetime import datetime
 from awscrt import mqtt, http
 from awsiot import mqtt_connection_builder
 import threading
+from processing.derivedMetrics import DERIVED_FIELDS
+from profiling import tracer
+from memory.memoryBudget import get_memory_budget, POLICY_SHED
+
+# AWS IoT Core rejects messages above 128 KB; leave room for the batch envelope
+AWS_IOT_MAX_MESSAGE_BYTES = 128 * 1024
+MESSAGE_ENVELOPE_BYTES = 1024
 
 class AWSIoTPublisher:
-    def __init__(self, credentials_dir="credentials"):
+    def __init__(self, credentials_dir="credentials", client_id_suffix="", data_location=None):
         """
         Initialize AWS IoT Publisher
         Args:
             credentials_dir: Directory containing AWS IoT credentials
+            client_id_suffix: Appended to the client ID (e.g. per worker process)
+            data_location: Location used in the publish topic; DATA_LOCATION env var if None
         """
         self.credentials_dir = credentials_dir
+        self.client_id_suffix = client_id_suffix
+        self.data_location = data_location
         self.connection = None
         self.is_connected = False
         self.publish_count = 0
         self.connection_lock = threading.Lock()
         
+        # In-flight publish payloads count against the global memory budget
+        self.inflight_account = get_memory_budget().register("aws_inflight_publishes", POLICY_SHED)
+        self.inflight_count = 0
+        
         # Device-specific attributes (will be set by load_aws_config)
         self.device_name = None
         self.client_id = None
@@ -51,8 +66,8 @@ class AWSIoTPublisher:
             topic_template = config['topics']['publish']
             self.topic_template = topic_template
             
-            # Get DATA_LOCATION from environment
-            data_location = os.getenv('DATA_LOCATION', 'unknown')
+            # Get DATA_LOCATION from the caller or the environment
+            data_location = self.data_location or os.getenv('DATA_LOCATION', 'unknown')
             
             # If topic template doesn't have {DATA_LOCATION}, append it
             if '{DATA_LOCATION}' not in topic_template:
@@ -74,7 +89,7 @@ class AWSIoTPublisher:
             # Extract device name from certificate filename
             cert_filename = os.path.basename(self.cert_path)
             self.device_name = cert_filename.replace('_certificate.pem', '')
-            self.client_id = f"{self.device_name}-weather-edge"
+            self.client_id = f"{self.device_name}-weather-edge{self.client_id_suffix}"
             
             # Download Amazon Root CA if not exists
             if not os.path.exists(self.ca_path):
@@ -216,14 +231,26 @@ class AWSIoTPublisher:
         with self.connection_lock:
             self.is_connected = False
     
-    def on_publish_complete(self, future):
+    def on_publish_complete(self, future, trace_token=None, payload_size=0, on_complete=None):
         """Callback for when publish completes"""
+        self._release_inflight(payload_size)
+        ok = False
         try:
             future.result()  # This will raise an exception if publish failed
             self.publish_count += 1
+            ok = True
+            tracer.end_async(trace_token, ok=True)
             print(f"✅ AWS IoT publish {self.publish_count} completed successfully")
         except Exception as e:
+            tracer.end_async(trace_token, ok=False, error=str(e))
             print(f"❌ AWS IoT publish failed: {e}")
+        if on_complete:
+            on_complete(ok)
+    
+    def _release_inflight(self, payload_size):
+        self.inflight_account.release(payload_size)
+        with self.connection_lock:
+            self.inflight_count -= 1
     
     def connect(self):
         """Establish connection to AWS IoT Core"""
@@ -281,33 +308,28 @@ class AWSIoTPublisher:
             except Exception as e:
                 print(f"❌ Error during AWS IoT disconnect: {e}")
     
-    def publish_weather_data(self, weather_data, location="unknown"):
+    def publish_weather_data(self, weather_data, location="unknown", on_complete=None, timestamp=None):
         """
         Publish weather data to AWS IoT Core
         Args:
             weather_data: Dict containing weather sensor data
             location: Location identifier
+            on_complete: Optional callable(ok) invoked when the publish future completes
+            timestamp: Epoch seconds of the reading (as stored in InfluxDB); now if None
         """
         if not self.is_connected:
             print("⚠️ AWS IoT not connected, skipping publish")
             return False
         
         try:
+            reading_time = datetime.utcfromtimestamp(timestamp) if timestamp is not None else datetime.utcnow()
+            
             # Prepare the message payload
             message = {
                 "deviceId": self.client_id,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": reading_time.isoformat() + "Z",
                 "location": location,
-                "data": {
-                    "temperature": float(weather_data.get("Temperature", 0)),
-                    "humidity": float(weather_data.get("Humidity", 0)),
-                    "pressure": float(weather_data.get("Barometric Pressure", 0)),
-                    "windDirection": int(weather_data.get("Wind Direction", 0)),
-                    "avgWindSpeed": float(weather_data.get("Avg Wind Speed", 0)),
-                    "maxWindSpeed": float(weather_data.get("Max Wind Speed", 0)),
-                    "rainfall1hr": float(weather_data.get("Rainfall (1hr)", 0)),
-                    "rainfall24hr": float(weather_data.get("Rainfall (24hr)", 0))
-                },
+                "data": self._build_data(weather_data),
                 "metadata": {
                     "source": "weather-edge-processor",
                     "version": "1.0",
@@ -315,34 +337,160 @@ class AWSIoTPublisher:
                 }
             }
             
-            message_json = json.dumps(message, indent=2)
-            
             print(f"Publishing to AWS IoT topic: {self.publish_topic}")
             print(f"Weather data: Temperature={weather_data.get('Temperature')}°C, Humidity={weather_data.get('Humidity')}%")
+            return self._publish_message(message, on_complete)
             
-            # Publish to AWS IoT
+        except Exception as e:
+            print(f"❌ Failed to publish to AWS IoT: {e}")
+            return False
+    
+    def publish_weather_batch(self, readings, timestamps, location="unknown", on_complete=None):
+        """
+        Publish a batch of weather readings to AWS IoT Core
+        The batch is split into as few messages as fit under the AWS IoT message size limit.
+        Args:
+            readings: List of dicts containing weather sensor data
+            timestamps: Epoch seconds for each reading
+            location: Location identifier
+            on_complete: Optional callable(ok) invoked once every part's publish future completed
+        """
+        if not self.is_connected:
+            print("⚠️ AWS IoT not connected, skipping publish")
+            return False
+        
+        try:
+            entries = [
+                {
+                    "timestamp": datetime.utcfromtimestamp(timestamp).isoformat() + "Z",
+                    "data": self._build_data(weather_data)
+                }
+                for weather_data, timestamp in zip(readings, timestamps)
+            ]
+            parts = self._split_entries(entries)
+            
+            print(f"Publishing batch of {len(readings)} readings in {len(parts)} message(s) to AWS IoT topic: {self.publish_topic}")
+            part_complete = self._gather_completions(len(parts), on_complete)
+            published = True
+            for index, part in enumerate(parts):
+                message = {
+                    "deviceId": self.client_id,
+                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "location": location,
+                    "readings": part,
+                    "metadata": {
+                        "source": "weather-edge-processor",
+                        "version": "1.0",
+                        "publishCount": self.publish_count + 1,
+                        "batchSize": len(part),
+                        "part": index + 1,
+                        "partCount": len(parts)
+                    }
+                }
+                if not self._publish_message(message, part_complete, indent=None):
+                    if part_complete:
+                        part_complete(False)
+                    published = False
+            return published
+            
+        except Exception as e:
+            print(f"❌ Failed to publish batch to AWS IoT: {e}")
+            return False
+    
+    def _split_entries(self, entries):
+        """Group batch entries into parts whose compact JSON messages stay under the size limit"""
+        limit = AWS_IOT_MAX_MESSAGE_BYTES - MESSAGE_ENVELOPE_BYTES
+        parts = [[]]
+        size = 0
+        for entry in entries:
+            entry_size = len(json.dumps(entry)) + 2
+            if parts[-1] and size + entry_size > limit:
+                parts.append([])
+                size = 0
+            parts[-1].append(entry)
+            size += entry_size
+        return parts
+    
+    def _gather_completions(self, count, on_complete):
+        """Callable(ok) that reports to on_complete once count parts have completed"""
+        if not on_complete:
+            return None
+        lock = threading.Lock()
+        state = {'remaining': count, 'ok': True}
+        
+        def part_complete(ok):
+            with lock:
+                state['remaining'] -= 1
+                state['ok'] = state['ok'] and ok
+                done = state['remaining'] == 0
+            if done:
+                on_complete(state['ok'])
+        return part_complete
+    
+    def _build_data(self, weather_data):
+        """Map a weather reading to the cloud payload field names"""
+        data = {
+            "temperature": float(weather_data.get("Temperature", 0)),
+            "humidity": float(weather_data.get("Humidity", 0)),
+            "pressure": float(weather_data.get("Barometric Pressure", 0)),
+            "windDirection": int(weather_data.get("Wind Direction", 0)),
+            "avgWindSpeed": float(weather_data.get("Avg Wind Speed", 0)),
+            "maxWindSpeed": float(weather_data.get("Max Wind Speed", 0)),
+            "rainfall1hr": float(weather_data.get("Rainfall (1hr)", 0)),
+            "rainfall24hr": float(weather_data.get("Rainfall (24hr)", 0))
+        }
+        
+        for name, (_, key) in DERIVED_FIELDS.items():
+            if name in weather_data:
+                data[key] = float(weather_data[name])
+        return data
+    
+    def _publish_message(self, message, on_complete=None, indent=2):
+        """Serialize and publish a message, tracking it until the publish future completes"""
+        message_json = json.dumps(message, indent=indent)
+        payload_size = len(message_json)
+        
+        # Shed instead of queueing more data behind a slow or stalled connection
+        if not self.inflight_account.reserve(payload_size):
+            self.inflight_account.record_shed()
+            print(f"⚠️ Memory budget reached with {self.inflight_count} publishes in flight, dropping AWS IoT publish")
+            return False
+        
+        # Publish to AWS IoT; the async span closes when the publish future completes
+        trace_token = tracer.begin_async("publish_weather_data.future", topic=self.publish_topic)
+        try:
             publish_result = self.connection.publish(
                 topic=self.publish_topic,
                 payload=message_json,
                 qos=mqtt.QoS.AT_LEAST_ONCE
             )
-            
-            # Handle different return types
-            if isinstance(publish_result, tuple):
-                publish_future, packet_id = publish_result
-                print(f"  → Packet ID: {packet_id}")
-            else:
-                publish_future = publish_result
-            
-            # Add completion callback
-            if hasattr(publish_future, 'add_done_callback'):
-                publish_future.add_done_callback(self.on_publish_complete)
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to publish to AWS IoT: {e}")
-            return False
+        except Exception:
+            self.inflight_account.release(payload_size)
+            tracer.end_async(trace_token, ok=False)
+            raise
+        with self.connection_lock:
+            self.inflight_count += 1
+        
+        # Handle different return types
+        if isinstance(publish_result, tuple):
+            publish_future, packet_id = publish_result
+            print(f"  → Packet ID: {packet_id}")
+        else:
+            publish_future = publish_result
+        
+        # Add completion callback
+        if hasattr(publish_future, 'add_done_callback'):
+            publish_future.add_done_callback(
+                lambda future: self.on_publish_complete(future, trace_token, payload_size, on_complete)
+            )
+        else:
+            # No completion callback available, stop accounting for it now
+            self._release_inflight(payload_size)
+            tracer.end_async(trace_token)
+            if on_complete:
+                on_complete(True)
+        
+        return True
     
     def is_connection_healthy(self):
         """Check if connection is healthy and still active"""
@@ -1,11 +1,22 @@
 import json
 import paho.mqtt.client as mqtt
+from profiling import tracer
+from .mqttCapture import CaptureWriter
+from processing.batchPayload import decompress_payload, batch_readings
 
 class MQTTReceiver:
-    def __init__(self, data_callback=None, mqtt_config=None):
+    def __init__(self, data_callback=None, mqtt_config=None, raw_callback=None):
+        """
+        Args:
+            data_callback: Called with each decoded JSON payload
+            mqtt_config: Broker connection settings from Config.get_mqtt_config()
+            raw_callback: If set, called with (topic, payload bytes) instead of decoding here
+        """
         self.data_callback = data_callback
+        self.raw_callback = raw_callback
         self.mqtt_config = mqtt_config or {}
         self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        self.capture = None
         self.setup_client()
 
     def setup_client(self):
@@ -20,6 +31,11 @@ class MQTTReceiver:
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
         self.client.on_disconnect = self.on_disconnect
+        
+        # Optionally record raw traffic for replay
+        capture_file = self.mqtt_config.get('capture_file')
+        if capture_file:
+            self.capture = CaptureWriter(capture_file)
 
     def on_connect(self, client, userdata, flags, reason_code, properties):
         print(f"MQTT Connected with result code {reason_code}")
@@ -27,14 +43,50 @@ class MQTTReceiver:
         client.subscribe(topic, qos=1)
         print(f"Subscribed to topic: {topic}")
 
+    def update_topic(self, topic):
+        """Move the subscription to a new topic without reconnecting"""
+        old_topic = self.mqtt_config.get('topic', 'weather/data')
+        if topic == old_topic:
+            return
+        # Reconnects (on_connect) subscribe to the new topic from now on
+        self.mqtt_config = dict(self.mqtt_config, topic=topic)
+
+        # Subscribe before unsubscribing so no message falls between the two
+        self.client.subscribe(topic, qos=1)
+        self.client.unsubscribe(old_topic)
+        print(f"Resubscribed from topic {old_topic} to {topic}")
+
     def on_message(self, client, userdata, msg):
+        if self.capture:
+            try:
+                self.capture.write(msg.topic, msg.payload, qos=msg.qos, dup=msg.dup, retain=msg.retain)
+            except Exception as e:
+                # Recording is best effort; a full disk must not stop ingestion
+                print(f"❌ Traffic capture failed, disabling capture: {e}")
+                self.disable_capture()
+        if self.raw_callback:
+            self.raw_callback(msg.topic, msg.payload)
+            return
+        self.handle_message(msg.topic, msg.payload)
+
+    def handle_message(self, topic, raw_payload):
+        """Decode a raw MQTT payload and hand it to the data callback"""
+        tracer.start_message(topic=topic)
         try:
-            payload = json.loads(msg.payload.decode("utf-8"))
-            print(f"Received message on {msg.topic}: {payload}")
+            with tracer.span("on_message.decode", bytes=len(raw_payload)):
+                max_bytes = self.mqtt_config.get('max_payload_bytes', 1024 * 1024)
+                payload = json.loads(decompress_payload(raw_payload, max_bytes).decode("utf-8"))
+            
+            readings = batch_readings(payload)
+            if readings is not None:
+                print(f"Received batch of {len(readings)} readings on {topic} ({len(raw_payload)} bytes)")
+            else:
+                print(f"Received message on {topic}: {payload}")
             
             # Call the callback function if provided
             if self.data_callback:
-                self.data_callback(payload)
+                with tracer.span("process_weather_data"):
+                    self.data_callback(payload)
             else:
                 print("⚠️ No data callback defined")
                 
@@ -59,6 +111,22 @@ class MQTTReceiver:
             print(f"❌ Failed to connect to MQTT broker: {e}")
             raise
 
+    def disable_capture(self):
+        capture, self.capture = self.capture, None
+        if capture:
+            try:
+                capture.close()
+            except Exception as e:
+                print(f"⚠️ Error closing traffic capture: {e}")
+
+    def close(self):
+        """Stop capturing and disconnect from the broker"""
+        self.disable_capture()
+        try:
+            self.client.disconnect()
+        except Exception as e:
+            print(f"⚠️ Error disconnecting MQTT client: {e}")
+
 # Legacy function for backward compatibility
 def start_mqtt_listener():
     """Legacy function - use MQTTReceiver class instead"""
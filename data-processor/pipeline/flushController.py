@@ -0,0 +1,114 @@
+import time
+import threading
+from collections import deque
+
+
+class AdaptiveFlushController:
+    def __init__(self, name, latency_slo, min_batch=1, max_batch=500,
+                 min_interval=0.05, max_interval=10.0, max_inflight=8,
+                 increase_step=1, decrease_factor=0.5, smoothing=0.2, history=50):
+        """
+        AIMD tuning of batch size, flush interval and in-flight concurrency for one sink
+        While observed round-trip latency stays under the SLO and flushes succeed, the
+        batch size and concurrency grow additively and the interval shrinks. A failed
+        flush or a latency above the SLO cuts them multiplicatively and backs off the interval.
+        Args:
+            name: Sink name used in reports
+            latency_slo: Target round-trip latency per flush in seconds
+            min_batch, max_batch: Batch size bounds
+            min_interval, max_interval: Flush interval bounds in seconds
+            max_inflight: Upper bound on concurrent flushes
+            increase_step: Additive batch size increase per healthy flush
+            decrease_factor: Multiplicative decrease on congestion or error
+            smoothing: EWMA weight of the newest latency/error sample
+            history: Number of recent decisions kept for inspection
+        """
+        self.name = name
+        self.latency_slo = latency_slo
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_inflight = max_inflight
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.smoothing = smoothing
+
+        self.lock = threading.Lock()
+        self.batch_size = min_batch
+        self.flush_interval = min_interval
+        self.inflight_limit = 1
+        self.latency_ewma = None
+        self.error_rate = 0.0
+        self.flush_count = 0
+        self.item_count = 0
+        self.error_count = 0
+        self.last_reason = None
+        self.decisions = deque(maxlen=history)
+
+    def limits(self):
+        """Current (batch_size, flush_interval, inflight_limit)"""
+        with self.lock:
+            return self.batch_size, self.flush_interval, self.inflight_limit
+
+    def record(self, latency, batch_size, ok):
+        """Feed back one completed flush and adjust the limits"""
+        with self.lock:
+            self.flush_count += 1
+            self.item_count += batch_size
+            if not ok:
+                self.error_count += 1
+
+            a = self.smoothing
+            self.latency_ewma = latency if self.latency_ewma is None else (1 - a) * self.latency_ewma + a * latency
+            self.error_rate = (1 - a) * self.error_rate + a * (0.0 if ok else 1.0)
+
+            if not ok:
+                self._decrease("error")
+            elif latency > self.latency_slo:
+                self._decrease("latency above SLO")
+            elif batch_size >= self.batch_size or self.inflight_limit < self.max_inflight:
+                # Only grow when the current limits are actually being used
+                self._increase()
+            else:
+                return
+
+            self.decisions.append({
+                'time': time.time(),
+                'reason': self.last_reason,
+                'latency_ms': round(latency * 1000, 1),
+                'latency_ewma_ms': round(self.latency_ewma * 1000, 1),
+                'error_rate': round(self.error_rate, 3),
+                'batch_size': self.batch_size,
+                'flush_interval_s': round(self.flush_interval, 3),
+                'inflight_limit': self.inflight_limit
+            })
+
+    def _increase(self):
+        self.last_reason = "healthy, additive increase"
+        self.batch_size = min(self.max_batch, self.batch_size + self.increase_step)
+        self.inflight_limit = min(self.max_inflight, self.inflight_limit + 1)
+        self.flush_interval = max(self.min_interval, self.flush_interval * 0.9)
+
+    def _decrease(self, reason):
+        self.last_reason = f"{reason}, multiplicative decrease"
+        self.batch_size = max(self.min_batch, int(self.batch_size * self.decrease_factor))
+        self.inflight_limit = max(1, int(self.inflight_limit * self.decrease_factor))
+        self.flush_interval = min(self.max_interval, self.flush_interval / self.decrease_factor)
+
+    def snapshot(self):
+        """Current limits, observed latency/error rate and recent decisions"""
+        with self.lock:
+            return {
+                'sink': self.name,
+                'latency_slo_ms': round(self.latency_slo * 1000, 1),
+                'batch_size': self.batch_size,
+                'flush_interval_s': round(self.flush_interval, 3),
+                'inflight_limit': self.inflight_limit,
+                'latency_ewma_ms': round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+                'error_rate': round(self.error_rate, 3),
+                'flushes': self.flush_count,
+                'items': self.item_count,
+                'errors': self.error_count,
+                'recent_decisions': list(self.decisions)
+            }
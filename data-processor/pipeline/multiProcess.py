@@ -0,0 +1,225 @@
+import os
+import sys
+import signal
+import itertools
+import multiprocessing
+from .sharedRing import SharedRingBuffer, STOP_MARKER
+from processing.batchPayload import split_batch_payload
+
+
+def default_processor_factory(worker_index, worker_count):
+    """Build a worker's WeatherDataProcessor with its own InfluxDB and AWS IoT connections"""
+    from dataProcessor import WeatherDataProcessor
+    return WeatherDataProcessor(worker_index=worker_index, worker_count=worker_count)
+
+
+def _worker_main(ring_spec, worker_index, worker_count, processor_factory, quiet):
+    """Worker process: drain the ring and run the full pipeline on each message"""
+    # Shutdown is driven by the receiver through the ring, not by terminal signals
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+    from mqtt.mqttReceiver import MQTTReceiver
+
+    ring = SharedRingBuffer(spec=ring_spec)
+    processor = processor_factory(worker_index, worker_count)
+    decoder = MQTTReceiver(data_callback=processor.process_weather_data)
+    print(f"✅ Worker {worker_index} started (pid {os.getpid()})")
+
+    try:
+        while True:
+            message = ring.get(timeout=1.0)
+            if message is None:
+                continue
+            if message == STOP_MARKER:
+                break
+            decoder.handle_message(*message)
+    finally:
+        processor.shutdown()
+        ring.close()
+        print(f"Worker {worker_index} stopped")
+
+
+class MultiProcessPipeline:
+    def __init__(self, worker_count, slot_count=1024, slot_size=16384,
+                 put_timeout=5.0, processor_factory=default_processor_factory, quiet=False,
+                 max_payload_bytes=1024 * 1024):
+        """
+        Receive MQTT in this process and process messages in worker processes
+        Raw payloads are handed to workers through one shared-memory ring per
+        worker; each worker owns its own sink connections.
+        Args:
+            worker_count: Number of worker processes
+            slot_count: Messages each worker's ring can hold
+            slot_size: Maximum bytes per message (topic + payload + header)
+            put_timeout: Seconds to wait for a full ring before dropping a message
+            processor_factory: Picklable callable(worker_index, worker_count) -> processor
+            quiet: Silence worker stdout (used by benchmarks)
+            max_payload_bytes: Decompressed size limit when splitting oversized batches
+        """
+        self.worker_count = worker_count
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.put_timeout = put_timeout
+        self.processor_factory = processor_factory
+        self.quiet = quiet
+        self.max_payload_bytes = max_payload_bytes
+        self.rings = []
+        self.workers = []
+        self.next_worker = None
+        self.mqtt_receiver = None
+        self.config_watcher = None
+        self.dispatched_count = 0
+        self.dropped_count = 0
+        self.workers_failed = False
+
+    def start_workers(self):
+        """Create the rings and start one worker process per ring"""
+        # Workers inherit ignored SIGHUP/SIGUSR1, so a signal relayed before their processor
+        # has installed its own handlers (or with profiling disabled) cannot kill them
+        previous_handlers = {
+            signum: signal.signal(signum, signal.SIG_IGN) for signum in (signal.SIGHUP, signal.SIGUSR1)
+        }
+        for i in range(self.worker_count):
+            ring = SharedRingBuffer(self.slot_count, self.slot_size)
+            worker = multiprocessing.Process(
+                target=_worker_main,
+                args=(ring.spec(), i, self.worker_count, self.processor_factory, self.quiet),
+                name=f"weather-worker-{i}",
+                daemon=True
+            )
+            worker.start()
+            self.rings.append(ring)
+            self.workers.append(worker)
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        self.next_worker = itertools.cycle(range(self.worker_count))
+        print(f"✅ Started {self.worker_count} worker processes")
+
+    def dispatch(self, topic, payload):
+        """Hand a raw message to the next live worker (round-robin)"""
+        # Batches too large for a ring slot are split into several messages
+        if self.rings and len(topic.encode("utf-8")) + len(payload) > self.rings[0].max_payload:
+            return self.dispatch_split(topic, payload)
+        return self._dispatch_one(topic, payload)
+
+    def _dispatch_one(self, topic, payload):
+        for _ in range(self.worker_count):
+            index = next(self.next_worker)
+            if self.workers[index].is_alive():
+                break
+        else:
+            # Stop consuming rather than acknowledge messages nobody can process; the
+            # process then exits non-zero and the container restart policy takes over
+            print("❌ No live worker processes, stopping the MQTT receiver")
+            self.dropped_count += 1
+            self.workers_failed = True
+            if self.mqtt_receiver:
+                self.mqtt_receiver.close()
+            return False
+
+        if self.rings[index].put(topic, payload, timeout=self.put_timeout):
+            self.dispatched_count += 1
+            return True
+
+        self.dropped_count += 1
+        if len(payload) + len(topic) > self.rings[index].max_payload:
+            print(f"⚠️ Message of {len(payload)} bytes exceeds ring slot size, dropping")
+        else:
+            print(f"⚠️ Worker {index} ring full for {self.put_timeout}s, dropping message")
+        return False
+
+    def dispatch_split(self, topic, payload):
+        """Split an oversized batch into ring-sized JSON chunks and dispatch each"""
+        max_chunk = self.rings[0].max_payload - len(topic.encode("utf-8"))
+        try:
+            chunks = split_batch_payload(payload, max_chunk, self.max_payload_bytes)
+        except Exception as e:
+            chunks = None
+            print(f"⚠️ Could not split oversized message: {e}")
+        if not chunks:
+            self.dropped_count += 1
+            print(f"⚠️ Message of {len(payload)} bytes exceeds ring slot size, dropping")
+            return False
+
+        print(f"Split batch of {len(payload)} bytes into {len(chunks)} ring messages")
+        results = [self._dispatch_one(topic, chunk) for chunk in chunks]
+        return all(results)
+
+    def start_processing(self):
+        """Start workers and feed them from the MQTT receiver (blocks)"""
+        from config import Config, ConfigWatcher
+        from mqtt.mqttReceiver import MQTTReceiver
+
+        if Config.CONFIG_FILE:
+            Config.reload()
+        Config.validate()
+        print("✅ Configuration validated successfully")
+        print(f"Starting multi-process pipeline with {self.worker_count} workers...")
+
+        self.start_workers()
+        self.mqtt_receiver = MQTTReceiver(
+            raw_callback=self.dispatch,
+            mqtt_config=Config.get_mqtt_config()
+        )
+
+        # Workers watch the config file and their credentials themselves; the
+        # receiver only owns the subscription and relays SIGHUP to them
+        self.config_watcher = ConfigWatcher(
+            callback=self.reload_config,
+            config_file=Config.CONFIG_FILE,
+            interval=Config.CONFIG_WATCH_INTERVAL
+        )
+        self.config_watcher.install_signal_handler()
+        self.config_watcher.start()
+
+        # The receiver does no processing worth profiling; hand profiler requests to the workers
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.relay_signal(signum))
+
+        print("Starting MQTT listener...")
+        self.mqtt_receiver.start_listening()
+        if self.workers_failed:
+            raise RuntimeError("All worker processes have exited")
+
+    def reload_config(self, changed_paths=()):
+        """Apply a topic change to the live subscription and have the workers reload too"""
+        from config import Config
+
+        changes = Config.reload()
+        if 'MQTT_TOPIC' in changes and self.mqtt_receiver:
+            self.mqtt_receiver.update_topic(Config.MQTT_TOPIC)
+        self.relay_signal(signal.SIGHUP)
+
+    def relay_signal(self, signum):
+        """Forward a signal to every live worker process"""
+        for worker in self.workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signum)
+
+    def stop_workers(self, timeout=30.0):
+        """Let each worker drain its ring, then wait for it to exit"""
+        for ring, worker in zip(self.rings, self.workers):
+            if worker.is_alive():
+                ring.put_stop()
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                print(f"⚠️ {worker.name} did not stop in time, terminating")
+                worker.terminate()
+                worker.join()
+        for ring in self.rings:
+            ring.close()
+        self.rings = []
+        self.workers = []
+
+    def shutdown(self):
+        """Stop receiving, drain the workers and release shared memory"""
+        print("Shutting down multi-process pipeline...")
+        if self.config_watcher:
+            self.config_watcher.stop()
+        if self.mqtt_receiver:
+            self.mqtt_receiver.close()
+            self.mqtt_receiver = None
+        self.stop_workers()
+        print(f"✅ Shutdown complete ({self.dispatched_count} dispatched, {self.dropped_count} dropped)")
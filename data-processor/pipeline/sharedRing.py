@@ -0,0 +1,107 @@
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+
+# Each slot holds one message: SLOT_HEADER followed by the topic and raw payload bytes
+SLOT_HEADER = struct.Struct("<IH")  # payload length, topic length
+STOP_MARKER = 0xFFFFFFFF
+
+
+class SharedRingBuffer:
+    def __init__(self, slot_count=1024, slot_size=16384, spec=None):
+        """
+        Single-producer single-consumer ring of fixed-size slots in shared memory
+        Messages are copied as raw bytes into the slots; only the ring spec is
+        pickled, once, when a worker process starts.
+        Args:
+            slot_count: Number of messages the ring can hold
+            slot_size: Bytes per slot (header + topic + payload)
+            spec: Spec from an existing ring's spec() to attach to it instead of creating one
+        """
+        if spec is None:
+            self.slot_count = slot_count
+            self.slot_size = slot_size
+            self.shm = shared_memory.SharedMemory(create=True, size=slot_count * slot_size)
+            self.free_slots = multiprocessing.Semaphore(slot_count)
+            self.filled_slots = multiprocessing.Semaphore(0)
+            self.owner = True
+        else:
+            self.slot_count = spec['slot_count']
+            self.slot_size = spec['slot_size']
+            self.shm = shared_memory.SharedMemory(name=spec['name'])
+            self.free_slots = spec['free_slots']
+            self.filled_slots = spec['filled_slots']
+            self.owner = False
+
+        # Producer and consumer each track their own position; the semaphores order the handoff
+        self.head = 0
+        self.tail = 0
+        self.max_payload = self.slot_size - SLOT_HEADER.size
+
+    def spec(self):
+        """Everything a worker process needs to attach to this ring"""
+        return {
+            'name': self.shm.name,
+            'slot_count': self.slot_count,
+            'slot_size': self.slot_size,
+            'free_slots': self.free_slots,
+            'filled_slots': self.filled_slots,
+        }
+
+    def put(self, topic, payload, timeout=None):
+        """Copy a message into the next free slot; False if oversized or the ring stayed full"""
+        topic_bytes = topic.encode("utf-8")
+        if len(topic_bytes) + len(payload) > self.max_payload:
+            return False
+        if not self.free_slots.acquire(timeout=timeout):
+            return False
+
+        offset = (self.head % self.slot_count) * self.slot_size
+        buf = self.shm.buf
+        SLOT_HEADER.pack_into(buf, offset, len(payload), len(topic_bytes))
+        start = offset + SLOT_HEADER.size
+        buf[start:start + len(topic_bytes)] = topic_bytes
+        start += len(topic_bytes)
+        buf[start:start + len(payload)] = payload
+        self.head += 1
+
+        self.filled_slots.release()
+        return True
+
+    def put_stop(self):
+        """Tell the consumer to exit once it has drained everything before this marker"""
+        self.free_slots.acquire()
+        offset = (self.head % self.slot_count) * self.slot_size
+        SLOT_HEADER.pack_into(self.shm.buf, offset, STOP_MARKER, 0)
+        self.head += 1
+        self.filled_slots.release()
+
+    def get(self, timeout=None):
+        """
+        Take the next message
+        Returns:
+            (topic, payload) tuple, None on timeout, or STOP_MARKER after put_stop()
+        """
+        if not self.filled_slots.acquire(timeout=timeout):
+            return None
+
+        offset = (self.tail % self.slot_count) * self.slot_size
+        buf = self.shm.buf
+        payload_len, topic_len = SLOT_HEADER.unpack_from(buf, offset)
+        self.tail += 1
+        if payload_len == STOP_MARKER:
+            self.free_slots.release()
+            return STOP_MARKER
+
+        start = offset + SLOT_HEADER.size
+        topic = bytes(buf[start:start + topic_len]).decode("utf-8")
+        start += topic_len
+        payload = bytes(buf[start:start + payload_len])
+
+        self.free_slots.release()
+        return topic, payload
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,105 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from memory.memoryBudget import get_memory_budget, POLICY_SHED
+
+# Rough in-memory size of one queued reading, used for memory budget accounting
+ITEM_SIZE_ESTIMATE = 1024
+
+
+class SinkBatcher:
+    def __init__(self, name, flush_fn, controller):
+        """
+        Queue items for one sink and flush them in batches sized by an AdaptiveFlushController
+        Args:
+            name: Sink name (thread names, budget account, reports)
+            flush_fn: Callable(items, on_complete) that sends a batch and eventually calls
+                on_complete(ok) - synchronously for blocking sinks, from a callback for async ones
+            controller: AdaptiveFlushController tuning this sink
+        """
+        self.name = name
+        self.flush_fn = flush_fn
+        self.controller = controller
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.inflight = 0
+        self.running = True
+        self.account = get_memory_budget().register(f"{name}_batch_queue", POLICY_SHED)
+        self.executor = ThreadPoolExecutor(max_workers=controller.max_inflight, thread_name_prefix=f"{name}-flush")
+        self.thread = threading.Thread(target=self._run, name=f"{name}-batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, item):
+        """Queue an item for the next flush; False if shed by the memory budget"""
+        if not self.account.reserve(ITEM_SIZE_ESTIMATE):
+            self.account.record_shed()
+            print(f"⚠️ Memory budget reached, dropping item for {self.name}")
+            return False
+        with self.condition:
+            self.queue.append((time.monotonic(), item))
+            self.condition.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.condition:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                self.inflight += 1
+            self.account.release(ITEM_SIZE_ESTIMATE * len(batch))
+            self.executor.submit(self._flush, batch)
+
+    def _next_batch(self):
+        """Wait (holding the condition) until a batch is due and a flush slot is free"""
+        while True:
+            batch_size, flush_interval, inflight_limit = self.controller.limits()
+            if not self.queue:
+                if not self.running:
+                    return None
+                self.condition.wait()
+                continue
+
+            oldest_age = time.monotonic() - self.queue[0][0]
+            due = len(self.queue) >= batch_size or oldest_age >= flush_interval or not self.running
+            if not due:
+                self.condition.wait(flush_interval - oldest_age)
+                continue
+            if self.inflight >= inflight_limit:
+                self.condition.wait(0.1)
+                continue
+
+            count = min(batch_size, len(self.queue))
+            return [self.queue.popleft()[1] for _ in range(count)]
+
+    def _flush(self, batch):
+        start = time.monotonic()
+        completed = threading.Event()
+
+        def on_complete(ok):
+            if completed.is_set():
+                return
+            completed.set()
+            self.controller.record(time.monotonic() - start, len(batch), ok)
+            with self.condition:
+                self.inflight -= 1
+                self.condition.notify_all()
+
+        try:
+            self.flush_fn(batch, on_complete)
+        except Exception as e:
+            print(f"❌ {self.name} flush failed: {e}")
+            on_complete(False)
+
+    def pending(self):
+        with self.condition:
+            return len(self.queue)
+
+    def close(self, timeout=30.0):
+        """Flush everything still queued and stop the batcher thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,86 @@
+import json
+import math
+import time
+import zlib
+
+# Batched payloads from devices that buffer offline or sample fast:
+#   [{"Timestamp": 1718000000, "Temperature": 25.1, ...}, ...]
+#   {"readings": [{"Timestamp": 1718000000, ...}, ...]}
+# either of which may be gzip- or zlib-compressed. "Timestamp" is epoch
+# seconds (milliseconds are accepted). It is required on batch readings and
+# optional on single readings, which default to the receive time.
+TIMESTAMP_FIELD = "Timestamp"
+GZIP_MAGIC = b"\x1f\x8b"
+# Plausible Timestamp range: from 2000-01-01 up to a day ahead of this clock
+MIN_TIMESTAMP = 946684800
+MAX_CLOCK_SKEW = 86400
+
+
+def decompress_payload(raw_payload, max_bytes=1024 * 1024):
+    """Return the payload bytes, decompressing gzip/zlib payloads up to max_bytes"""
+    if raw_payload[:2] == GZIP_MAGIC:
+        wbits = 16 + zlib.MAX_WBITS
+    elif len(raw_payload) >= 2 and raw_payload[0] == 0x78 and (raw_payload[0] * 256 + raw_payload[1]) % 31 == 0:
+        wbits = zlib.MAX_WBITS
+    else:
+        return raw_payload
+
+    decompressor = zlib.decompressobj(wbits)
+    data = decompressor.decompress(raw_payload, max_bytes)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Decompressed payload exceeds {max_bytes} bytes")
+    return data
+
+
+def batch_readings(payload):
+    """Return the list of readings if payload is a batch, otherwise None"""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict) and isinstance(payload.get("readings"), list):
+        return payload["readings"]
+    return None
+
+
+def reading_timestamp(reading, default):
+    """Epoch seconds from a reading's Timestamp field, or default if absent or invalid"""
+    value = reading.get(TIMESTAMP_FIELD)
+    # JSON true/false would otherwise pass as epoch 1/0
+    if value is None or isinstance(value, bool):
+        return default
+    try:
+        timestamp = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(timestamp):
+        return default
+    # Devices without a seconds clock may send milliseconds
+    if timestamp > 1e11:
+        timestamp /= 1000.0
+    if not MIN_TIMESTAMP <= timestamp <= time.time() + MAX_CLOCK_SKEW:
+        return default
+    return timestamp
+
+
+def split_batch_payload(raw_payload, max_chunk_bytes, max_bytes=1024 * 1024):
+    """
+    Re-encode a batch as uncompressed JSON arrays of at most max_chunk_bytes each
+    Returns the list of chunks, or None if the payload is not a batch.
+    """
+    readings = batch_readings(json.loads(decompress_payload(raw_payload, max_bytes).decode("utf-8")))
+    if readings is None:
+        return None
+
+    chunks = []
+    current = []
+    size = 2
+    for reading in readings:
+        encoded = json.dumps(reading, separators=(",", ":")).encode("utf-8")
+        if current and size + len(encoded) + 1 > max_chunk_bytes:
+            chunks.append(b"[" + b",".join(current) + b"]")
+            current = []
+            size = 2
+        current.append(encoded)
+        size += len(encoded) + 1
+    if current:
+        chunks.append(b"[" + b",".join(current) + b"]")
+    return chunks
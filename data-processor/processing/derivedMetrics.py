@@ -0,0 +1,377 @@
+import math
+import time
+import numpy as np
+from memory.memoryBudget import get_memory_budget, POLICY_FIXED
+
+# Derived field name -> (InfluxDB field, AWS IoT payload key)
+DERIVED_FIELDS = {
+    "Dew Point": ("dew_point", "dewPoint"),
+    "Heat Index": ("heat_index", "heatIndex"),
+    "Wind Chill": ("wind_chill", "windChill"),
+    "Pressure Tendency (3hr)": ("pressure_tendency_3hr", "pressureTendency3hr"),
+    "Rain Rate": ("rain_rate", "rainRate"),
+}
+
+PRESSURE_TENDENCY_WINDOW = 3 * 3600  # seconds
+PRESSURE_TENDENCY_TOLERANCE = 1800  # how much older than the window the reference sample may be
+PRESSURE_HISTORY_RESOLUTION = 60  # seconds; at most one pressure sample is kept per interval
+RAIN_RATE_MAX_GAP = 3600  # seconds between readings before rain rate is unknown
+
+
+def dew_point(temperature, humidity):
+    """Dew point in °C (Magnus formula), vectorized over NumPy arrays"""
+    temperature = np.asarray(temperature, dtype=np.float64)
+    humidity = np.clip(np.asarray(humidity, dtype=np.float64), 1e-6, 100.0)
+    a, b = 17.62, 243.12
+    gamma = np.log(humidity / 100.0) + (a * temperature) / (b + temperature)
+    return (b * gamma) / (a - gamma)
+
+
+def heat_index(temperature, humidity):
+    """Heat index in °C (NWS Rothfusz regression), vectorized over NumPy arrays"""
+    temperature = np.asarray(temperature, dtype=np.float64)
+    humidity = np.asarray(humidity, dtype=np.float64)
+    t = temperature * 9.0 / 5.0 + 32.0
+    rh = humidity
+
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh
+        - 0.22475541 * t * rh - 6.83783e-3 * t * t
+        - 5.481717e-2 * rh * rh + 1.22874e-3 * t * t * rh
+        + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh
+    )
+    # NWS adjustments for very dry and very humid conditions
+    dry = (rh < 13) & (t >= 80) & (t <= 112)
+    full = np.where(
+        dry,
+        full - ((13 - rh) / 4) * np.sqrt(np.clip((17 - np.abs(t - 95.0)) / 17, 0, None)),
+        full
+    )
+    humid = (rh > 85) & (t >= 80) & (t <= 87)
+    full = np.where(humid, full + ((rh - 85) / 10) * ((87 - t) / 5), full)
+
+    hi = np.where((simple + t) / 2 >= 80.0, full, simple)
+    # Below 80°F the heat index is not defined and equals the air temperature
+    hi = np.where(t < 80.0, t, hi)
+    return (hi - 32.0) * 5.0 / 9.0
+
+
+def wind_chill(temperature, wind_speed):
+    """Wind chill in °C from temperature (°C) and wind speed (m/s), vectorized"""
+    temperature = np.asarray(temperature, dtype=np.float64)
+    v = np.asarray(wind_speed, dtype=np.float64) * 3.6  # km/h
+    v016 = np.power(np.clip(v, 0, None), 0.16)
+    wc = 13.12 + 0.6215 * temperature - 11.37 * v016 + 0.3965 * temperature * v016
+    # Only defined for cold, windy conditions; otherwise it equals the air temperature
+    return np.where((temperature <= 10.0) & (v > 4.8), wc, temperature)
+
+
+def _dew_point_scalar(temperature, humidity):
+    """Scalar dew_point() for the single-reading path"""
+    humidity = min(max(humidity, 1e-6), 100.0)
+    a, b = 17.62, 243.12
+    gamma = math.log(humidity / 100.0) + (a * temperature) / (b + temperature)
+    return (b * gamma) / (a - gamma)
+
+
+def _heat_index_scalar(temperature, humidity):
+    """Scalar heat_index() for the single-reading path"""
+    t = temperature * 9.0 / 5.0 + 32.0
+    rh = humidity
+    if t < 80.0:
+        return temperature
+
+    hi = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    if (hi + t) / 2 >= 80.0:
+        hi = (
+            -42.379 + 2.04901523 * t + 10.14333127 * rh
+            - 0.22475541 * t * rh - 6.83783e-3 * t * t
+            - 5.481717e-2 * rh * rh + 1.22874e-3 * t * t * rh
+            + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh
+        )
+        if rh < 13 and 80 <= t <= 112:
+            hi -= ((13 - rh) / 4) * math.sqrt(max((17 - abs(t - 95.0)) / 17, 0))
+        elif rh > 85 and 80 <= t <= 87:
+            hi += ((rh - 85) / 10) * ((87 - t) / 5)
+    return (hi - 32.0) * 5.0 / 9.0
+
+
+def _wind_chill_scalar(temperature, wind_speed):
+    """Scalar wind_chill() for the single-reading path"""
+    v = wind_speed * 3.6
+    if temperature > 10.0 or v <= 4.8:
+        return temperature
+    v016 = v ** 0.16
+    return 13.12 + 0.6215 * temperature - 11.37 * v016 + 0.3965 * temperature * v016
+
+
+class _RingBuffer:
+    """Fixed-capacity (timestamp, value) history backed by NumPy arrays"""
+
+    def __init__(self, capacity, resolution=0):
+        self.capacity = capacity
+        self.resolution = resolution
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.start = 0
+        self.size = 0
+
+    def extend(self, timestamps, values):
+        timestamps = np.asarray(timestamps, dtype=np.float64)[-self.capacity:]
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        n = len(timestamps)
+        if n == 0:
+            return
+        end = (self.start + self.size) % self.capacity
+        idx = (end + np.arange(n)) % self.capacity
+        self.timestamps[idx] = timestamps
+        self.values[idx] = values
+        overflow = max(0, self.size + n - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def last_timestamp(self):
+        return self.timestamps[(self.start + self.size - 1) % self.capacity] if self.size else None
+
+    def append(self, timestamp, value):
+        """Add one sample; in-order samples are written in place without re-sorting"""
+        last = self.last_timestamp()
+        if last is not None and timestamp < last:
+            self.merge([timestamp], [value])
+            return
+        if last is not None and self.resolution and timestamp // self.resolution <= last // self.resolution:
+            return
+        end = (self.start + self.size) % self.capacity
+        self.timestamps[end] = timestamp
+        self.values[end] = value
+        if self.size == self.capacity:
+            self.start = (self.start + 1) % self.capacity
+        else:
+            self.size += 1
+
+    def latest_at_or_before(self, timestamp):
+        """(timestamp, value) of the latest sample at or before timestamp, or None"""
+        # The ring is sorted oldest first, split into at most two contiguous segments
+        end = self.start + self.size
+        segments = [(self.start, min(end, self.capacity))]
+        if end > self.capacity:
+            segments.append((0, end - self.capacity))
+        for lo, hi in reversed(segments):
+            i = int(self.timestamps[lo:hi].searchsorted(timestamp, side="right"))
+            if i > 0:
+                return float(self.timestamps[lo + i - 1]), float(self.values[lo + i - 1])
+        return None
+
+    def merge(self, timestamps, values):
+        """Add samples in timestamp order, even when they are older than the history"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if len(timestamps) == 0:
+            return
+        timestamps, values = self._downsample(timestamps, values)
+        last = self.last_timestamp()
+        if last is None or timestamps.min() >= last:
+            if last is not None and self.resolution:
+                keep = np.floor(timestamps / self.resolution) > np.floor(last / self.resolution)
+                timestamps, values = timestamps[keep], values[keep]
+            self.extend(timestamps, values)
+            return
+
+        # Late samples (e.g. a catch-up batch): re-sort and keep the newest capacity samples
+        hist_ts, hist_values = self.ordered()
+        all_ts = np.concatenate([hist_ts, timestamps])
+        all_values = np.concatenate([hist_values, values])
+        order = np.argsort(all_ts, kind="stable")
+        all_ts, all_values = self._downsample(all_ts[order], all_values[order])
+        all_ts, all_values = all_ts[-self.capacity:], all_values[-self.capacity:]
+        self.start = 0
+        self.size = len(all_ts)
+        self.timestamps[:self.size] = all_ts
+        self.values[:self.size] = all_values
+
+    def _downsample(self, timestamps, values):
+        """Keep the first sample of each resolution interval (input sorted by timestamp)"""
+        if not self.resolution:
+            return timestamps, values
+        _, first = np.unique(np.floor(timestamps / self.resolution), return_index=True)
+        return timestamps[first], values[first]
+
+    def ordered(self):
+        """Return (timestamps, values) oldest first"""
+        idx = (self.start + np.arange(self.size)) % self.capacity
+        return self.timestamps[idx], self.values[idx]
+
+    def nbytes(self):
+        return self.timestamps.nbytes + self.values.nbytes
+
+
+class DerivedMetricsEngine:
+    def __init__(self, tendency_window=PRESSURE_TENDENCY_WINDOW, history_resolution=PRESSURE_HISTORY_RESOLUTION,
+                 history_capacity=None):
+        """
+        Compute derived weather metrics once per reading at the edge
+        Args:
+            tendency_window: Pressure tendency lookback in seconds
+            history_resolution: Seconds per stored pressure sample, so the history covers
+                the lookback regardless of how fast readings arrive
+            history_capacity: Pressure samples kept; defaults to enough for the lookback
+        """
+        self.tendency_window = tendency_window
+        if history_capacity is None:
+            span = tendency_window + PRESSURE_TENDENCY_TOLERANCE
+            history_capacity = int(np.ceil(span / history_resolution)) + 2 if history_resolution else 2048
+        self.pressure_history = _RingBuffer(history_capacity, history_resolution)
+        get_memory_budget().register("derived_pressure_history", POLICY_FIXED).set_usage(
+            self.pressure_history.nbytes()
+        )
+        self.last_rain_timestamp = None
+        self.last_rain_total = None
+
+    def compute(self, data, timestamp=None):
+        """Compute derived metrics for a single reading (plain math, no NumPy per-call overhead)"""
+        if timestamp is None:
+            timestamp = time.time()
+        temperature = float(data.get("Temperature", 0))
+        humidity = float(data.get("Humidity", 0))
+        values = {
+            "Dew Point": _dew_point_scalar(temperature, humidity),
+            "Heat Index": _heat_index_scalar(temperature, humidity),
+            "Wind Chill": _wind_chill_scalar(temperature, float(data.get("Avg Wind Speed", 0))),
+            "Pressure Tendency (3hr)": self._pressure_tendency_scalar(
+                timestamp, float(data.get("Barometric Pressure", 0))
+            ),
+            "Rain Rate": self._rain_rate_scalar(timestamp, float(data.get("Rainfall (24hr)", 0))),
+        }
+        return {
+            name: round(value, 2)
+            for name, value in values.items()
+            if value is not None and math.isfinite(value)
+        }
+
+    def compute_batch(self, readings, timestamps=None):
+        """
+        Compute derived metrics for a batch of readings in one NumPy pass
+        Args:
+            readings: List of validated weather data dicts, oldest first
+            timestamps: Epoch seconds per reading (defaults to now)
+        Returns:
+            List of dicts keyed by DERIVED_FIELDS names, NaN results omitted
+        """
+        if not readings:
+            return []
+        if timestamps is None:
+            timestamps = [time.time()] * len(readings)
+
+        ts = np.asarray(timestamps, dtype=np.float64)
+        temperature = self._column(readings, "Temperature")
+        humidity = self._column(readings, "Humidity")
+        pressure = self._column(readings, "Barometric Pressure")
+        wind_speed = self._column(readings, "Avg Wind Speed")
+        rain_total = self._column(readings, "Rainfall (24hr)")
+
+        columns = {
+            "Dew Point": dew_point(temperature, humidity),
+            "Heat Index": heat_index(temperature, humidity),
+            "Wind Chill": wind_chill(temperature, wind_speed),
+            "Pressure Tendency (3hr)": self._pressure_tendency(ts, pressure),
+            "Rain Rate": self._rain_rate(ts, rain_total),
+        }
+
+        results = []
+        for i in range(len(readings)):
+            derived = {}
+            for name, values in columns.items():
+                value = values[i]
+                if np.isfinite(value):
+                    derived[name] = round(float(value), 2)
+            results.append(derived)
+        return results
+
+    def enrich(self, data, timestamp=None):
+        """Add derived metrics to a reading in place and return it"""
+        data.update(self.compute(data, timestamp))
+        return data
+
+    def enrich_batch(self, readings, timestamps=None):
+        """Add derived metrics to each reading of a batch in place and return them"""
+        for data, derived in zip(readings, self.compute_batch(readings, timestamps)):
+            data.update(derived)
+        return readings
+
+    def _column(self, readings, field):
+        return np.fromiter(
+            (float(r.get(field, 0)) for r in readings),
+            dtype=np.float64,
+            count=len(readings)
+        )
+
+    def _pressure_tendency(self, ts, pressure):
+        """Change in pressure (hPa) over the tendency window, NaN until enough history"""
+        hist_ts, hist_p = self.pressure_history.ordered()
+        all_ts = np.concatenate([hist_ts, ts])
+        all_p = np.concatenate([hist_p, pressure])
+        # A catch-up batch can be older than the live history; the lookup needs sorted samples
+        last = self.pressure_history.last_timestamp()
+        in_order = (last is None or ts[0] >= last) and bool(np.all(ts[1:] >= ts[:-1]))
+        if not in_order:
+            order = np.argsort(all_ts, kind="stable")
+            all_ts = all_ts[order]
+            all_p = all_p[order]
+
+        # Latest sample at or before (t - window) for every new reading
+        idx = np.searchsorted(all_ts, ts - self.tendency_window, side="right") - 1
+        valid = idx >= 0
+        valid[valid] = all_ts[idx[valid]] >= ts[valid] - self.tendency_window - PRESSURE_TENDENCY_TOLERANCE
+        tendency = np.full(len(ts), np.nan)
+        tendency[valid] = pressure[valid] - all_p[idx[valid]]
+
+        self.pressure_history.merge(ts, pressure)
+        return tendency
+
+    def _pressure_tendency_scalar(self, timestamp, pressure):
+        """Single-reading _pressure_tendency()"""
+        reference = self.pressure_history.latest_at_or_before(timestamp - self.tendency_window)
+        self.pressure_history.append(timestamp, pressure)
+        if reference is None:
+            return None
+        reference_ts, reference_p = reference
+        if reference_ts < timestamp - self.tendency_window - PRESSURE_TENDENCY_TOLERANCE:
+            return None
+        return pressure - reference_p
+
+    def _rain_rate_scalar(self, timestamp, rain_total):
+        """Single-reading _rain_rate()"""
+        prev_ts, prev_total = self.last_rain_timestamp, self.last_rain_total
+        rate = None
+        if prev_ts is not None and 0 < timestamp - prev_ts <= RAIN_RATE_MAX_GAP:
+            rate = max(rain_total - prev_total, 0.0) / (timestamp - prev_ts) * 3600.0
+        if prev_ts is None or timestamp >= prev_ts:
+            self.last_rain_timestamp = timestamp
+            self.last_rain_total = rain_total
+        return rate
+
+    def _rain_rate(self, ts, rain_total):
+        """Rain rate in mm/h from consecutive 24hr accumulation readings"""
+        prev_ts = np.empty_like(ts)
+        prev_total = np.empty_like(rain_total)
+        prev_ts[1:] = ts[:-1]
+        prev_total[1:] = rain_total[:-1]
+        # Only the latest reading is remembered, so a batch older than it has no known predecessor
+        if self.last_rain_timestamp is not None and self.last_rain_timestamp <= ts[0]:
+            prev_ts[0] = self.last_rain_timestamp
+            prev_total[0] = self.last_rain_total
+        else:
+            prev_ts[0] = np.nan
+            prev_total[0] = np.nan
+
+        dt = ts - prev_ts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # The rolling 24hr total drops as old rain leaves the window; that is not negative rain
+            rate = np.clip(rain_total - prev_total, 0, None) / dt * 3600.0
+        rate[~((dt > 0) & (dt <= RAIN_RATE_MAX_GAP))] = np.nan
+
+        if self.last_rain_timestamp is None or ts[-1] >= self.last_rain_timestamp:
+            self.last_rain_timestamp = float(ts[-1])
+            self.last_rain_total = float(rain_total[-1])
+        return rate
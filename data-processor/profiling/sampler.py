@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import signal
+import threading
+from collections import Counter
+
+
+class SamplingProfiler:
+    def __init__(self, output_dir="traces", duration=30.0, interval=0.01):
+        """
+        Statistical profiler that samples all thread stacks on demand
+        Args:
+            output_dir: Directory for collapsed-stack dumps (flamegraph.pl / speedscope input)
+            duration: Seconds to sample per dump
+            interval: Seconds between samples
+        """
+        self.output_dir = output_dir
+        self.duration = duration
+        self.interval = interval
+        self.running = threading.Event()
+
+    def install_signal_handler(self, signum=signal.SIGUSR1):
+        """Start a sampling run whenever the process receives signum"""
+        try:
+            signal.signal(signum, self._on_signal)
+            print(f"Sampling profiler armed: send {signal.Signals(signum).name} to dump a {self.duration:.0f}s profile")
+            return True
+        except (ValueError, AttributeError, OSError) as e:
+            # Not on the main thread, or the signal is unavailable on this platform
+            print(f"⚠️ Could not install profiler signal handler: {e}")
+            return False
+
+    def _on_signal(self, signum, frame):
+        self.trigger()
+
+    def trigger(self):
+        """Start a background sampling run unless one is already in progress"""
+        if self.running.is_set():
+            print("⚠️ Sampling profiler already running")
+            return False
+        self.running.set()
+        threading.Thread(target=self._run, name="sampling-profiler", daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            print(f"Sampling profiler started for {self.duration:.0f}s")
+            stacks = self.sample(self.duration)
+            path = self.dump(stacks)
+            print(f"✅ Sampling profile written to {path}")
+        except Exception as e:
+            print(f"❌ Sampling profiler failed: {e}")
+        finally:
+            self.running.clear()
+
+    def sample(self, duration):
+        """Collect collapsed stacks for every thread except the sampler itself"""
+        stacks = Counter()
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                frames.append(names.get(thread_id, str(thread_id)))
+                stacks[";".join(reversed(frames))] += 1
+            time.sleep(self.interval)
+
+        return stacks
+
+    def dump(self, stacks):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
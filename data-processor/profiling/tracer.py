@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import itertools
+import threading
+
+# Spans are written in the Chrome Trace Event format (JSON array form, trailing
+# bracket optional) so files open directly in Perfetto or chrome://tracing.
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer used when profiling is disabled - every call is a no-op"""
+    enabled = False
+
+    def span(self, name, **args):
+        return _NULL_SPAN
+
+    def start_message(self, **args):
+        return None
+
+    def begin_async(self, name, **args):
+        return None
+
+    def end_async(self, token, **args):
+        pass
+
+    def close(self):
+        pass
+
+
+class RotatingTraceWriter:
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backup_count=3, flush_interval=1.0, flush_events=100):
+        """
+        Append trace events to a size-rotated local file
+        A trace left by a previous (possibly crashed) run is rotated away, not truncated,
+        and events are flushed regularly so a killed process still leaves a usable trace.
+        Args:
+            path: Trace file path (rotated files get .1, .2, ... suffixes)
+            max_bytes: Size at which the file is rotated
+            backup_count: Number of rotated files to keep
+            flush_interval: Seconds after which buffered events are flushed
+            flush_events: Number of events after which buffered events are flushed
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.lock = threading.Lock()
+        self.file = None
+        self.bytes_written = 0
+        self.unflushed = 0
+        self.last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._rotate_files()
+        self._open()
+
+    def _open(self):
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write("[\n")
+        self.bytes_written = 2
+
+    def _rotate(self):
+        self.file.close()
+        self._rotate_files()
+        self._open()
+
+    def _rotate_files(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+
+    def write(self, event):
+        line = json.dumps(event, separators=(",", ":")) + ",\n"
+        with self.lock:
+            if self.file is None:
+                return
+            if self.bytes_written + len(line) > self.max_bytes:
+                self._rotate()
+            self.file.write(line)
+            self.bytes_written += len(line)
+            self.unflushed += 1
+            now = time.monotonic()
+            if self.unflushed >= self.flush_events or now - self.last_flush >= self.flush_interval:
+                self.file.flush()
+                self.unflushed = 0
+                self.last_flush = now
+
+    def flush(self):
+        with self.lock:
+            if self.file:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start_us", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_us = time.time_ns() // 1000
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_us = (time.perf_counter_ns() - self.start) // 1000
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.emit({
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start_us,
+            "dur": duration_us,
+            "args": self.args,
+        })
+        return False
+
+
+class Tracer:
+    """Tracer that records per-message spans to a RotatingTraceWriter"""
+    enabled = True
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pid = os.getpid()
+        self.message_ids = itertools.count(1)
+        self.async_ids = itertools.count(1)
+        self.local = threading.local()
+
+    def start_message(self, **args):
+        """Start a new message trace on this thread; later spans are tagged with its id"""
+        message_id = next(self.message_ids)
+        self.local.message_id = message_id
+        return message_id
+
+    def _args(self, args):
+        message_id = getattr(self.local, "message_id", None)
+        if message_id is not None:
+            args["msg"] = message_id
+        return args
+
+    def span(self, name, **args):
+        return _Span(self, name, self._args(args))
+
+    def begin_async(self, name, **args):
+        """Begin a span that is finished on another thread (e.g. a publish future)"""
+        token = (name, next(self.async_ids))
+        self.emit({
+            "name": name,
+            "cat": "async",
+            "ph": "b",
+            "id": token[1],
+            "ts": time.time_ns() // 1000,
+            "args": self._args(args),
+        })
+        return token
+
+    def end_async(self, token, **args):
+        if token is None:
+            return
+        name, async_id = token
+        self.emit({
+            "name": name,
+            "cat": "async",
+            "ph": "e",
+            "id": async_id,
+            "ts": time.time_ns() // 1000,
+            "args": args,
+        })
+
+    def emit(self, event):
+        event["pid"] = self.pid
+        event["tid"] = threading.get_ident()
+        self.writer.write(event)
+
+    def close(self):
+        self.writer.close()
+
+
+_tracer = NullTracer()
+
+
+def configure_tracer(enabled, path, max_bytes, backup_count):
+    """Install the process-wide tracer"""
+    global _tracer
+    _tracer.close()
+    if enabled:
+        _tracer = Tracer(RotatingTraceWriter(path, max_bytes, backup_count))
+        print(f"Tracing enabled, writing spans to {path}")
+    else:
+        _tracer = NullTracer()
+    return _tracer
+
+
+def get_tracer():
+    return _tracer
+
+
+def span(name, **args):
+    return _tracer.span(name, **args)
+
+
+def start_message(**args):
+    return _tracer.start_message(**args)
+
+
+def begin_async(name, **args):
+    return _tracer.begin_async(name, **args)
+
+
+def end_async(token, **args):
+    _tracer.end_async(token, **args)
@@ -1,6 +1,8 @@
 import sys
 import signal
+from config import Config
 from dataProcessor import WeatherDataProcessor
+from pipeline.multiProcess import MultiProcessPipeline
 
 def signal_handler(sig, frame):
     """Handle shutdown signals gracefully"""
@@ -16,7 +18,11 @@ def main():
     processor = None
     try:
         print("Starting Weather Data Processing Pipeline...")
-        processor = WeatherDataProcessor()
+        pipeline_config = Config.get_pipeline_config()
+        if pipeline_config['worker_count'] > 1:
+            processor = MultiProcessPipeline(**pipeline_config)
+        else:
+            processor = WeatherDataProcessor()
         processor.start_processing()
         
     except KeyboardInterrupt: